@@ -1,5 +1,8 @@
 import asyncio
 import logging
+import signal
+from dataclasses import dataclass
+from pathlib import Path
 from typing import Optional
 
 from aiohttp.client_exceptions import ClientConnectorError
@@ -10,27 +13,36 @@ from aiogram.client.telegram import TelegramAPIServer
 from aiogram.exceptions import TelegramNetworkError
 from aiogram.fsm.storage.memory import MemoryStorage
 
+from bot.fsm.storage import SQLiteStorage
 from bot.handlers import admin, common, projects, start, global_back
+from bot.middlewares.metrics import setup_metrics
+from bot.middlewares.scheduler import UpdateScheduler, UserEventIsolation
+from bot.utils.ui import InlineCleaner
 from core.config import Settings
 from core.constants import AppPaths
+from core.render_cache import render_cache
 from db.session import Database
 from services.logging_service import LogService
 from services.menu_service import MenuService
+from services.notification_service import NotificationService
+from services.perf_service import PerfRecorder
+from services.project_read_model import ProjectReadModel
 from services.project_service import ProjectService
 from services.session_manager import SessionManager
 from services.user_service import UserService
 
 
-def _build_session(settings: Settings) -> Optional[AiohttpSession]:
+def _build_session(settings: Settings, server: Optional[TelegramAPIServer]) -> Optional[AiohttpSession]:
     timeout: Optional[float] = None
     if settings.telegram_request_timeout and settings.telegram_request_timeout > 0:
         timeout = settings.telegram_request_timeout
-    if not settings.telegram_proxy and timeout is None:
+    if not settings.telegram_proxy and timeout is None and server is None:
         return None
-    return AiohttpSession(
-        proxy=settings.telegram_proxy,
-        timeout=timeout,
-    )
+    session_kwargs = {"proxy": settings.telegram_proxy, "timeout": timeout}
+    if server:
+        # در aiogram 3 سرور جایگزین Bot API روی session تنظیم می‌شود نه روی Bot
+        session_kwargs["api"] = server
+    return AiohttpSession(**session_kwargs)
 
 
 def _build_server(settings: Settings) -> Optional[TelegramAPIServer]:
@@ -51,35 +63,133 @@ def _build_server(settings: Settings) -> Optional[TelegramAPIServer]:
     return None
 
 
-async def main() -> None:
-    settings = Settings.load()
-    paths = AppPaths()
-    database = Database(settings.db_path)
+def _install_stats_dump(database: Database, logs_root: str) -> None:
+    """`kill -USR1 <pid>` writes per-query counters to logs/query_stats.json."""
+    target = Path(logs_root) / "query_stats.json"
+    try:
+        asyncio.get_running_loop().add_signal_handler(
+            signal.SIGUSR1, database.stats.dump, target
+        )
+    except (AttributeError, NotImplementedError, RuntimeError):
+        # ویندوز سیگنال USR1 ندارد
+        pass
+
+
+@dataclass
+class BotApp:
+    """The wired-up bot; main() runs it, benchmarks/load_test.py drives it against a fake Bot API."""
+
+    settings: Settings
+    database: Database
+    bot: Bot
+    dp: Dispatcher
+    log_service: LogService
+    session_manager: SessionManager
+    notification_service: NotificationService
+    inline_cleaner: InlineCleaner
+    perf_recorder: PerfRecorder
+
+    async def close(self) -> None:
+        await self.inline_cleaner.close()
+        await self.notification_service.stop()
+        await self.session_manager.close()
+        await self.perf_recorder.stop()
+        await self.log_service.stop()
+        await self.database.close()
+
+
+async def build_app(settings: Settings, paths: AppPaths) -> BotApp:
+    database = Database(
+        settings.db_path,
+        pool_size=settings.db_pool_size,
+        profile=settings.sqlite,
+        statement_cache_size=settings.db_statement_cache_size,
+    )
+    await database.connect()
     await database.run_migrations(paths.migrations_dir)
+    _install_stats_dump(database, paths.logs_root)
 
-    session_manager = SessionManager(storage_path="data/session_cache.json")
+    session_manager = SessionManager(
+        storage_path=paths.session_cache,
+        profile_ttl=settings.session_profile_ttl,
+        save_delay=settings.session_save_delay,
+        database=database if settings.session_backend == "sqlite" else None,
+        inline_message_limit=settings.inline_message_limit,
+    )
+    await session_manager.start()
     user_service = UserService(database)
-    project_service = ProjectService(database)
+    user_service.subscribe(session_manager.invalidate_user)
+    read_model = None
+    if settings.project_read_model:
+        read_model = ProjectReadModel()
+        await read_model.load(database)
+    project_service = ProjectService(database, read_model=read_model)
+    render_cache.resize(settings.render_cache_size)
+    project_service.subscribe(render_cache.invalidate)
     menu_service = MenuService()
     log_service = LogService(
         paths.logs_root,
         settings.log_level,
         log_to_console=settings.log_to_console,
+        queue_size=settings.log_queue_size,
+        batch_size=settings.log_batch_size,
+        flush_interval=settings.log_flush_interval,
+        overflow_policy=settings.log_overflow_policy,
+        sample_rate=settings.log_sample_rate,
     )
+    await log_service.start()
+    perf_recorder = PerfRecorder(
+        window=settings.perf_window,
+        slow_threshold_ms=settings.perf_slow_threshold_ms,
+        dump_interval=settings.perf_dump_interval,
+        log_service=log_service,
+        logs_root=paths.logs_root,
+    )
+    await perf_recorder.start()
 
     bot_kwargs = {
         "token": settings.bot_token,
         "default": DefaultBotProperties(parse_mode="HTML"),
     }
-    session = _build_session(settings)
+    session = _build_session(settings, _build_server(settings))
     if session:
         bot_kwargs["session"] = session
-    server = _build_server(settings)
-    if server:
-        bot_kwargs["server"] = server
     bot = Bot(**bot_kwargs)
-    storage = MemoryStorage()
-    dp = Dispatcher(storage=storage)
+    notification_service = NotificationService(
+        bot,
+        settings.updates_group_ids,
+        coalesce_window=settings.notify_coalesce_window,
+        global_rate=settings.notify_global_rate,
+        group_rate=settings.notify_group_rate,
+        max_retries=settings.notify_max_retries,
+        log_service=log_service,
+    )
+    await notification_service.start()
+    inline_cleaner = InlineCleaner(
+        concurrency=settings.inline_cleanup_concurrency,
+        rate=settings.inline_cleanup_rate,
+        deferred=settings.inline_cleanup_deferred,
+    )
+    if settings.fsm_storage == "sqlite":
+        storage = SQLiteStorage(
+            database,
+            cache_size=settings.fsm_cache_size,
+            state_ttl=settings.fsm_state_ttl,
+            compact_interval=settings.fsm_compact_interval,
+        )
+    else:
+        storage = MemoryStorage()
+    # قفل هر کاربر پیش از خواندن وضعیت FSM گرفته می‌شود تا آپدیت‌های صف‌شده با وضعیت درست مسیریابی شوند
+    dp = Dispatcher(storage=storage, events_isolation=UserEventIsolation())
+    scheduler = UpdateScheduler(
+        max_concurrency=settings.update_concurrency,
+        max_pending=settings.update_max_pending,
+        overload_policy=settings.update_overload_policy,
+    )
+    dp.update.outer_middleware(scheduler)
+    setup_metrics(dp, bot, perf_recorder)
+    if isinstance(storage, SQLiteStorage):
+        dp.startup.register(storage.start)
     dp.include_routers(
         global_back.router,
         start.router,
@@ -95,6 +205,9 @@ async def main() -> None:
             "project_service": project_service,
             "menu_service": menu_service,
             "log_service": log_service,
+            "notification_service": notification_service,
+            "inline_cleaner": inline_cleaner,
+            "perf_recorder": perf_recorder,
             "bot_username": settings.bot_username,
             "updates_group_id": settings.updates_group_id,
             "enable_group_id_command": settings.enable_group_id_command,
@@ -107,18 +220,48 @@ async def main() -> None:
         await log_service.error(f"خطا: {exc}")
         return True
 
-    while True:
-        try:
-            await dp.start_polling(bot)
-            break
-        except (TelegramNetworkError, ClientConnectorError) as exc:
-            await log_service.error(
-                f"خطای ارتباط با تلگرام: {exc}. تلاش مجدد پس از {settings.telegram_retry_delay} ثانیه."
+    return BotApp(
+        settings=settings,
+        database=database,
+        bot=bot,
+        dp=dp,
+        log_service=log_service,
+        session_manager=session_manager,
+        notification_service=notification_service,
+        inline_cleaner=inline_cleaner,
+        perf_recorder=perf_recorder,
+    )
+
+
+async def main() -> None:
+    settings = Settings.load()
+    app = await build_app(settings, AppPaths())
+    dp, bot, log_service = app.dp, app.bot, app.log_service
+
+    try:
+        if settings.run_mode == "webhook":
+            # سرور aiohttp و وب‌هوک aiogram فقط در این حالت لازم است و import آن در polling هزینه اضافه دارد
+            from bot.webhook import run_webhook
+
+            await log_service.info(
+                f"دریافت آپدیت‌ها با وب‌هوک روی {settings.webhook_host}:{settings.webhook_port}{settings.webhook_path}"
             )
-            await asyncio.sleep(settings.telegram_retry_delay)
-        except asyncio.CancelledError:
-            await log_service.info("Polling متوقف شد (Cancel).")
-            break
+            await run_webhook(dp, bot, settings)
+        else:
+            while True:
+                try:
+                    await dp.start_polling(bot)
+                    break
+                except (TelegramNetworkError, ClientConnectorError) as exc:
+                    await log_service.error(
+                        f"خطای ارتباط با تلگرام: {exc}. تلاش مجدد پس از {settings.telegram_retry_delay} ثانیه."
+                    )
+                    await asyncio.sleep(settings.telegram_retry_delay)
+                except asyncio.CancelledError:
+                    await log_service.info("Polling متوقف شد (Cancel).")
+                    break
+    finally:
+        await app.close()
 
 
 if __name__ == "__main__":
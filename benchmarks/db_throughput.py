@@ -0,0 +1,103 @@
+"""Compare per-query connections against the pooled Database.
+
+Run from the repository root:
+
+    python -m benchmarks.db_throughput --queries 2000 --concurrency 8
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+import aiosqlite
+
+from core.constants import AppPaths
+from db.session import Database
+
+READ_QUERY = "SELECT * FROM projects WHERE id = ? AND status != 'deleted'"
+WRITE_QUERY = "UPDATE projects SET description = ? WHERE id = ?"
+
+
+async def _seed(database: Database, rows: int) -> None:
+    for index in range(rows):
+        await database.execute(
+            "INSERT INTO projects(title, description, status, owner_name, start_date) VALUES (?, ?, 'pending', NULL, '2024-01-01')",
+            (f"project {index}", "seed"),
+        )
+
+
+async def _legacy_fetchone(path: str, query: str, params) -> None:
+    conn = await aiosqlite.connect(path)
+    conn.row_factory = aiosqlite.Row
+    try:
+        cursor = await conn.execute(query, params)
+        await cursor.fetchone()
+        await cursor.close()
+    finally:
+        await conn.close()
+
+
+async def _legacy_execute(path: str, query: str, params) -> None:
+    conn = await aiosqlite.connect(path)
+    try:
+        await conn.execute(query, params)
+        await conn.commit()
+    finally:
+        await conn.close()
+
+
+async def _drive(worker, queries: int, concurrency: int) -> float:
+    counter = iter(range(queries))
+
+    async def loop() -> None:
+        for index in counter:
+            await worker(index)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(loop() for _ in range(concurrency)))
+    return queries / (time.perf_counter() - started)
+
+
+async def run(queries: int, concurrency: int, rows: int, write_ratio: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "bench.db")
+        database = Database(path, pool_size=concurrency)
+        await database.run_migrations(AppPaths().migrations_dir)
+        await _seed(database, rows)
+
+        async def legacy(index: int) -> None:
+            project_id = index % rows + 1
+            if write_ratio and index % write_ratio == 0:
+                await _legacy_execute(path, WRITE_QUERY, (f"d{index}", project_id))
+            else:
+                await _legacy_fetchone(path, READ_QUERY, (project_id,))
+
+        async def pooled(index: int) -> None:
+            project_id = index % rows + 1
+            if write_ratio and index % write_ratio == 0:
+                await database.execute(WRITE_QUERY, (f"d{index}", project_id))
+            else:
+                await database.fetchone(READ_QUERY, (project_id,))
+
+        legacy_qps = await _drive(legacy, queries, concurrency)
+        pooled_qps = await _drive(pooled, queries, concurrency)
+        await database.close()
+
+    print(f"queries={queries} concurrency={concurrency} write_ratio=1/{write_ratio or 'inf'}")
+    print(f"connect-per-query : {legacy_qps:10.1f} q/s")
+    print(f"pooled connections: {pooled_qps:10.1f} q/s  (x{pooled_qps / legacy_qps:.1f})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--write-ratio", type=int, default=10, help="one write every N queries (0 = reads only)")
+    args = parser.parse_args()
+    asyncio.run(run(args.queries, args.concurrency, args.rows, args.write_ratio))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Drive the Dispatcher with a synthetic burst of updates and check per-user ordering and limits.
+
+Each fake user sends numbered messages. A user's FSM state cycles through Step.first/second/third
+and every state has its own StateFilter handler, so number n must be routed by the dispatcher to
+the handler of state n % 3. An update routed with a stale state (wrong handler or the fallback)
+or handled out of order is counted as a violation; the run exits 1 if any occurred.
+
+Run from the repository root:
+
+    python -m benchmarks.dispatcher_load --users 200 --messages 20 --concurrency 32
+    python -m benchmarks.dispatcher_load --policy shed --max-pending 500
+    python -m benchmarks.dispatcher_load --no-scheduler
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from typing import Dict, List, Optional
+
+from aiogram import Bot, Dispatcher, Router, types
+from aiogram.filters import StateFilter
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.state import State, StatesGroup
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.types import Update
+
+from benchmarks.webhook_poster import fake_update
+from bot.middlewares.scheduler import UpdateScheduler, UserEventIsolation
+
+
+class Step(StatesGroup):
+    first = State()
+    second = State()
+    third = State()
+
+
+STEPS = (Step.first, Step.second, Step.third)
+
+
+def _build_dispatcher(handler_ms: float, violations: List[str], isolated: bool) -> Dispatcher:
+    router = Router()
+
+    def step_handler(index: int):
+        async def handle_step(message: types.Message, state: FSMContext) -> None:
+            number = int(message.text)
+            if number % len(STEPS) != index:
+                violations.append(f"{message.from_user.id}: {number} routed to {STEPS[index].state}")
+            data = await state.get_data()
+            if number != data.get("last", -1) + 1:
+                violations.append(f"{message.from_user.id}: {number} after {data.get('last')}")
+            # شبیه‌سازی کار هندلر (کوئری و فراخوانی API) بین مسیریابی و نوشتن وضعیت بعدی
+            await asyncio.sleep(random.uniform(0.5, 1.5) * handler_ms / 1000)
+            await state.update_data(last=number)
+            await state.set_state(STEPS[(number + 1) % len(STEPS)])
+
+        return handle_step
+
+    # کاربر تازه هنوز وضعیتی ندارد و پیام 0 را در مرحله اول می‌فرستد
+    router.message.register(step_handler(0), StateFilter(None, Step.first))
+    router.message.register(step_handler(1), StateFilter(Step.second))
+    router.message.register(step_handler(2), StateFilter(Step.third))
+
+    @router.message()
+    async def fallback(message: types.Message, raw_state: Optional[str]) -> None:
+        violations.append(f"{message.from_user.id}: {message.text} reached fallback with state {raw_state}")
+
+    if isolated:
+        dp = Dispatcher(storage=MemoryStorage(), events_isolation=UserEventIsolation())
+    else:
+        dp = Dispatcher(storage=MemoryStorage())
+    dp.include_router(router)
+    return dp
+
+
+async def run(args: argparse.Namespace) -> None:
+    violations: List[str] = []
+    dp = _build_dispatcher(args.handler_ms, violations, isolated=not args.no_scheduler)
+    scheduler = None
+    if not args.no_scheduler:
+        scheduler = UpdateScheduler(
+            max_concurrency=args.concurrency,
+            max_pending=args.max_pending,
+            overload_policy=args.policy,
+        )
+        dp.update.outer_middleware(scheduler)
+    bot = Bot("42:LOADTEST")
+    next_number: Dict[int, int] = {user: 0 for user in range(1, args.users + 1)}
+    updates = []
+    for _ in range(args.users * args.messages):
+        user = random.choice([user for user, sent in next_number.items() if sent < args.messages])
+        updates.append(Update.model_validate(fake_update(user, str(next_number[user]))))
+        next_number[user] += 1
+
+    latencies: List[float] = []
+
+    async def feed(update: Update) -> None:
+        started = time.perf_counter()
+        await dp.feed_update(bot, update)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    # مثل start_polling هر آپدیت در یک تسک جدا اجرا می‌شود
+    await asyncio.gather(*(feed(update) for update in updates))
+    elapsed = time.perf_counter() - started
+    await bot.session.close()
+
+    latencies.sort()
+    p99 = latencies[max(0, int(len(latencies) * 0.99) - 1)]
+    print(f"updates={len(updates)} elapsed={elapsed:.2f}s throughput={len(updates) / elapsed:.0f}/s")
+    print(f"latency p50={statistics.median(latencies):.1f}ms p99={p99:.1f}ms")
+    print(f"ordering/routing violations={len(violations)}")
+    for violation in violations[:5]:
+        print(f"  {violation}")
+    if scheduler is not None:
+        print(f"scheduler={scheduler.stats()}")
+    # با shed آپدیت‌های دورریخته‌شده خودشان شکاف در ترتیب می‌سازند
+    if violations and scheduler is not None and not scheduler.stats()["shed"]:
+        sys.exit(1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--messages", type=int, default=20, help="messages per user")
+    parser.add_argument("--handler-ms", type=float, default=5.0)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--max-pending", type=int, default=1000)
+    parser.add_argument("--policy", choices=("queue", "shed"), default="queue")
+    parser.add_argument("--no-scheduler", action="store_true", help="no scheduler and no per-user isolation")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Local stand-in for the Telegram Bot API that answers like Telegram without delivering anything.
+
+Used by benchmarks.load_test; it can also run on its own so a bot started with
+TELEGRAM_API_BASE=http://127.0.0.1:8081 (e.g. for benchmarks.webhook_poster) talks to it:
+
+    python -m benchmarks.fake_bot_api --port 8081 --latency-ms 30
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import time
+from collections import Counter
+from typing import Any, Dict, Optional
+
+from aiohttp import web
+
+BOT_ID = 42
+
+
+class FakeBotAPI:
+    """
+    Answers `sendMessage` and `editMessageReplyMarkup` with the message object Telegram would
+    return, `getMe` with the bot user and every other method with `true`.
+    `latency_ms` is added to each response to mimic the round trip to Telegram.
+    """
+
+    def __init__(self, latency_ms: float = 0.0, bot_username: str = "loadtest_bot") -> None:
+        self._latency = max(0.0, latency_ms) / 1000
+        self._bot_user = {"id": BOT_ID, "is_bot": True, "first_name": "Load test", "username": bot_username}
+        self._message_ids = itertools.count(1)
+        self._runner: Optional[web.AppRunner] = None
+        self.calls: Counter = Counter()
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/bot{token}/{method}", self._handle)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving; returns the base URL to use as TELEGRAM_API_BASE."""
+        self._runner = web.AppRunner(self.app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = self._runner.addresses[0][1]
+        return f"http://{host}:{bound_port}"
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        self.calls[method] += 1
+        params = await request.post()
+        if self._latency:
+            await asyncio.sleep(self._latency)
+        return web.json_response({"ok": True, "result": self._result(method, params)})
+
+    def _result(self, method: str, params) -> Any:
+        if method == "getMe":
+            return self._bot_user
+        if method == "sendMessage":
+            return self._message(params, next(self._message_ids))
+        if method == "editMessageReplyMarkup" and "chat_id" in params:
+            return self._message(params, int(params["message_id"]))
+        return True
+
+    def _message(self, params, message_id: int) -> Dict[str, Any]:
+        chat_id = int(params["chat_id"])
+        message = {
+            "message_id": message_id,
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private" if chat_id > 0 else "supergroup"},
+            "from": self._bot_user,
+            "text": params.get("text", ""),
+        }
+        if params.get("reply_markup"):
+            markup = json.loads(params["reply_markup"])
+            if "inline_keyboard" in markup:
+                message["reply_markup"] = markup
+        return message
+
+
+async def _serve(host: str, port: int, latency_ms: float) -> None:
+    api = FakeBotAPI(latency_ms=latency_ms)
+    base = await api.start(host, port)
+    print(f"fake Bot API listening on {base} (Ctrl+C to stop)")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await api.stop()
+        print(f"calls={dict(api.calls)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(args.host, args.port, args.latency_ms))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Measure FSM lookup latency of SQLiteStorage against aiogram's MemoryStorage.
+
+Run from the repository root:
+
+    python -m benchmarks.fsm_storage --users 2000 --lookups 20000
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from bot.fsm.states import AdminCreateProject
+from bot.fsm.storage import SQLiteStorage
+from core.constants import AppPaths
+from db.session import Database
+
+
+def _key(user_id: int) -> StorageKey:
+    return StorageKey(bot_id=1, chat_id=user_id, user_id=user_id)
+
+
+async def _measure(storage, users: int, lookups: int) -> list:
+    for user_id in range(users):
+        await storage.set_state(_key(user_id), AdminCreateProject.waiting_start_date)
+        await storage.set_data(_key(user_id), {"project_title": f"p{user_id}", "project_status": "pending"})
+    samples = []
+    for _ in range(lookups):
+        key = _key(random.randrange(users))
+        started = time.perf_counter()
+        await storage.get_state(key)
+        await storage.get_data(key)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def _report(name: str, samples: list) -> None:
+    ordered = sorted(samples)
+    p99 = ordered[int(len(ordered) * 0.99) - 1]
+    print(f"{name:<30} mean={statistics.mean(samples):.4f}ms p50={statistics.median(samples):.4f}ms p99={p99:.4f}ms")
+
+
+async def run(users: int, lookups: int, cache_size: int) -> None:
+    _report("MemoryStorage", await _measure(MemoryStorage(), users, lookups))
+    with tempfile.TemporaryDirectory() as tmp:
+        database = Database(str(Path(tmp) / "bench.db"))
+        await database.run_migrations(AppPaths().migrations_dir)
+        storage = SQLiteStorage(database, cache_size=cache_size)
+        _report(f"SQLiteStorage (cache={cache_size})", await _measure(storage, users, lookups))
+        cold = SQLiteStorage(database, cache_size=1)
+        _report("SQLiteStorage (cold)", await _measure(cold, users, lookups // 10))
+        await database.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--lookups", type=int, default=20000)
+    parser.add_argument("--cache-size", type=int, default=4096)
+    args = parser.parse_args()
+    asyncio.run(run(args.users, args.lookups, args.cache_size))
+
+
+if __name__ == "__main__":
+    main()
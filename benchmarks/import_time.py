@@ -0,0 +1,145 @@
+"""Profile the import cost of the bot with `python -X importtime` and check it against a baseline.
+
+Each run imports the target module in a fresh interpreter; per-module self and cumulative times
+are the median over --runs. The check applies to the self time of this repository's own
+modules (dependencies such as aiogram cost the same whatever the bot does), so it catches a
+new heavy import at module level. Absolute times depend on the machine, so --compare judges a
+run against a baseline recorded on the same machine (like benchmarks.load_test); --budget-ms
+adds an absolute ceiling. Either check exits 1 when it fails.
+
+Run from the repository root:
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --save-baseline    # record benchmarks/baselines/import_time.json
+    python -m benchmarks.import_time --compare          # exit 1 if project modules got slower
+    python -m benchmarks.import_time --module app --runs 5 --top 30 --budget-ms 150
+"""
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+PROJECT_PACKAGES = ("app", "bot", "core", "db", "services")
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "import_time.json"
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)\s*$")
+
+
+def profile_once(module: str) -> Dict[str, Tuple[float, float]]:
+    """Import `module` in a fresh interpreter; maps module name to (self_ms, cumulative_ms)."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    result: Dict[str, Tuple[float, float]] = {}
+    for line in completed.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            result[match.group(4)] = (int(match.group(1)) / 1000, int(match.group(2)) / 1000)
+    return result
+
+
+def is_project_module(name: str) -> bool:
+    return name.split(".", 1)[0] in PROJECT_PACKAGES
+
+
+def profile(module: str, runs: int) -> Dict[str, Tuple[float, float]]:
+    samples: Dict[str, List[Tuple[float, float]]] = defaultdict(list)
+    for _ in range(runs):
+        for name, times in profile_once(module).items():
+            samples[name].append(times)
+    return {
+        name: (statistics.median(t[0] for t in times), statistics.median(t[1] for t in times))
+        for name, times in samples.items()
+    }
+
+
+def _compare(module: str, own: float, modules: Dict[str, float], baseline: dict, tolerance: float) -> bool:
+    if baseline.get("module") != module:
+        print(f"warning: baseline was recorded for {baseline.get('module')}, this run imported {module}")
+    ceiling = baseline["project_ms"] * (1 + tolerance)
+    if own <= ceiling:
+        print(f"within {tolerance:.0%} of baseline ({own:.1f}ms, baseline {baseline['project_ms']:.1f}ms)")
+        return True
+    print(f"REGRESSION project modules take {own:.1f}ms > {ceiling:.1f}ms (baseline {baseline['project_ms']:.1f}ms)")
+    grown = sorted(
+        ((name, self_ms - baseline["modules"].get(name, 0.0)) for name, self_ms in modules.items()),
+        key=lambda item: item[1],
+        reverse=True,
+    )
+    for name, delta in grown[:5]:
+        if delta > 0:
+            print(f"  {name:<60} +{delta:7.1f}ms")
+    return False
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="app")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float, default=None, help="absolute self time allowed for the repository's modules")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed regression, as a fraction")
+    args = parser.parse_args()
+
+    # یک import اولیه تا فایل‌های .pyc ساخته شوند و اجرای اول کندتر از بقیه نباشد
+    profile_once(args.module)
+    times = profile(args.module, max(1, args.runs))
+    total = times.get(args.module, (0.0, 0.0))[1]
+    by_package: Dict[str, float] = defaultdict(float)
+    for name, (self_ms, _) in times.items():
+        by_package["(project)" if is_project_module(name) else name.split(".", 1)[0]] += self_ms
+    own = by_package["(project)"]
+    modules = {name: self_ms for name, (self_ms, _) in times.items() if is_project_module(name)}
+
+    print(f"import {args.module}: {total:.1f}ms cumulative (median of {args.runs} runs)")
+    print("\nself time by top-level package:")
+    for package, self_ms in sorted(by_package.items(), key=lambda item: item[1], reverse=True)[: args.top]:
+        print(f"  {package:<40} {self_ms:8.1f}ms")
+    print("\nslowest modules (self / cumulative):")
+    for name, (self_ms, cumulative) in sorted(times.items(), key=lambda item: item[1][0], reverse=True)[: args.top]:
+        print(f"  {name:<60} {self_ms:8.1f}ms {cumulative:8.1f}ms")
+    print("\nproject modules (self / cumulative):")
+    for name, (self_ms, cumulative) in sorted(
+        ((name, value) for name, value in times.items() if is_project_module(name)),
+        key=lambda item: item[1][0],
+        reverse=True,
+    )[: args.top]:
+        print(f"  {name:<60} {self_ms:8.1f}ms {cumulative:8.1f}ms")
+
+    print(f"\nproject modules take {own:.1f}ms")
+    ok = True
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        baseline = {
+            "module": args.module,
+            "runs": args.runs,
+            "project_ms": round(own, 1),
+            "modules": {name: round(self_ms, 2) for name, self_ms in sorted(modules.items())},
+        }
+        args.baseline.write_text(json.dumps(baseline, indent=2) + "\n", encoding="utf-8")
+        print(f"baseline saved to {args.baseline}")
+    if args.compare:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        ok = _compare(args.module, own, modules, baseline, args.tolerance) and ok
+    if args.budget_ms is not None:
+        if own > args.budget_ms:
+            print(f"OVER BUDGET: project modules take {own:.1f}ms > {args.budget_ms:.1f}ms")
+            ok = False
+        else:
+            print(f"within budget ({args.budget_ms:.1f}ms)")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
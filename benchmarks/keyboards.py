@@ -0,0 +1,82 @@
+"""Compare cached keyboard markups against rebuilding them on every call.
+
+Run from the repository root:
+
+    python -m benchmarks.keyboards --calls 20000
+"""
+import argparse
+import random
+import statistics
+import time
+import tracemalloc
+
+from bot.keyboards import inline, reply
+
+# (نام، نسخه کش‌شده، نسخه بدون کش) کیبوردهایی که هندلرهای پرتکرار می‌سازند
+KEYBOARDS = (
+    (
+        "project_profile_keyboard",
+        lambda pid: inline.project_profile_keyboard(pid, pid % 2 == 0),
+        lambda pid: inline.project_profile_keyboard.__wrapped__(pid, pid % 2 == 0),
+    ),
+    (
+        "delete_confirmation_keyboard",
+        inline.delete_confirmation_keyboard,
+        inline.delete_confirmation_keyboard.__wrapped__,
+    ),
+    ("status_keyboard", lambda pid: inline.status_keyboard(), lambda pid: inline.status_keyboard.__wrapped__()),
+    (
+        "status_filter_keyboard",
+        lambda pid: inline.status_filter_keyboard(),
+        lambda pid: inline._status_filter_markup.__wrapped__(None),
+    ),
+    ("admin_menu_keyboard", lambda pid: reply.admin_menu_keyboard(), lambda pid: reply.admin_menu_keyboard.__wrapped__()),
+    ("back_keyboard", lambda pid: reply.back_keyboard(), lambda pid: reply.back_keyboard.__wrapped__()),
+)
+
+
+def _time(factory, ids) -> float:
+    started = time.perf_counter()
+    for project_id in ids:
+        factory(project_id)
+    return (time.perf_counter() - started) / len(ids) * 1e6
+
+
+def _handler_allocations(factories, ids) -> float:
+    """Mean peak bytes allocated while one simulated handler builds every keyboard."""
+    samples = []
+    tracemalloc.start()
+    for project_id in ids:
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        markups = [factory(project_id) for factory in factories]
+        samples.append(tracemalloc.get_traced_memory()[1] - baseline)
+        del markups
+    tracemalloc.stop()
+    return statistics.mean(samples)
+
+
+def run(calls: int, projects: int) -> None:
+    ids = [random.randrange(1, projects + 1) for _ in range(calls)]
+    print(f"{'keyboard':<30} {'rebuilt µs':>11} {'cached µs':>10} {'speedup':>8}")
+    for name, cached, rebuilt in KEYBOARDS:
+        rebuilt_us = _time(rebuilt, ids)
+        cached_us = _time(cached, ids)
+        print(f"{name:<30} {rebuilt_us:>11.2f} {cached_us:>10.2f} {rebuilt_us / cached_us:>7.1f}x")
+    sample = ids[: min(len(ids), 2000)]
+    rebuilt_bytes = _handler_allocations([rebuilt for _, _, rebuilt in KEYBOARDS], sample)
+    cached_bytes = _handler_allocations([cached for _, cached, _ in KEYBOARDS], sample)
+    print()
+    print(f"allocated per handler: rebuilt={rebuilt_bytes:.0f}B cached={cached_bytes:.0f}B")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--projects", type=int, default=200, help="distinct project ids (warm cache entries)")
+    args = parser.parse_args()
+    run(args.calls, args.projects)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""Drive the real bot (app.build_app) with scripted user flows against a local fake Bot API.
+
+Every virtual user repeatedly runs one of the flows below, chosen by --mix weights, feeding
+each step to the Dispatcher only after the previous one was handled:
+
+    start   /start project_<id> deep link from the project owner
+    list    📊 وضعیت پروژه ها (project links page and status filter counts)
+    status  project action -> new status -> back to menu (clears the inline keyboards)
+    group   /status from an admin in the updates group
+
+Run from the repository root:
+
+    python -m benchmarks.load_test --users 50 --iterations 20
+    python -m benchmarks.load_test --mix start=1,list=2,status=1,group=0 --api-latency-ms 30
+    python -m benchmarks.load_test --save-baseline    # record benchmarks/baselines/load_test.json
+    python -m benchmarks.load_test --compare          # exit 1 if throughput or p95 regressed
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from aiogram.types import Update
+
+from app import BotApp, build_app
+from benchmarks.fake_bot_api import BOT_ID, FakeBotAPI
+from benchmarks.webhook_poster import fake_update
+from bot.keyboards.inline import ProjectActionCallback, StatusCallback
+from core.config import Settings
+from core.constants import BACK_TO_MENU, AppPaths
+
+FLOWS = ("start", "list", "status", "group")
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "load_test.json"
+GROUP_CHAT_ID = -1001000000001
+STATUSES = ("pending", "in_progress", "MVP", "support_update")
+# آرگومان‌هایی که نتیجه را تغییر می‌دهند؛ مقایسه با baseline فقط با مقادیر یکسان معنا دارد
+COMPARABLE_ARGS = ("users", "admins", "projects", "iterations", "mix", "api_latency_ms", "seed", "read_model")
+
+_ids = itertools.count(10_000_000)
+
+
+def _group_update(user_id: int, text: str) -> dict:
+    update_id = next(_ids)
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": {"id": GROUP_CHAT_ID, "type": "supergroup", "title": "updates"},
+            "from": {"id": user_id, "is_bot": False, "first_name": f"user{user_id}"},
+            "text": text,
+        },
+    }
+
+
+def _callback_update(user_id: int, data: str) -> dict:
+    update_id = next(_ids)
+    return {
+        "update_id": update_id,
+        "callback_query": {
+            "id": str(update_id),
+            "chat_instance": str(user_id),
+            "from": {"id": user_id, "is_bot": False, "first_name": f"user{user_id}"},
+            "message": {
+                "message_id": update_id,
+                "date": int(time.time()),
+                "chat": {"id": user_id, "type": "private", "first_name": f"user{user_id}"},
+                # پیامی که دکمه زیر آن است را خود بات فرستاده
+                "from": {"id": BOT_ID, "is_bot": True, "first_name": "Load test"},
+                "text": "profile",
+            },
+            "data": data,
+        },
+    }
+
+
+def _parse_mix(raw: str) -> Dict[str, float]:
+    mix = {flow: 0.0 for flow in FLOWS}
+    for part in raw.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in mix:
+            raise SystemExit(f"unknown flow {name!r}; expected one of {', '.join(FLOWS)}")
+        mix[name.strip()] = float(weight or 1)
+    if not any(mix.values()):
+        raise SystemExit("--mix needs at least one flow with a positive weight")
+    return mix
+
+
+def _configure_env(workdir: Path, api_base: str, read_model: bool) -> None:
+    os.environ.update(
+        {
+            "BOT_TOKEN": "42:LOADTEST",
+            "BOT_USERNAME": "loadtest_bot",
+            "DB_PATH": str(workdir / "app.db"),
+            "TELEGRAM_API_BASE": api_base,
+            "TELEGRAM_FILE_API_BASE": "",
+            "TELEGRAM_PROXY": "",
+            "UPDATES_GROUP_ID": "",
+            "UPDATES_GROUP_IDS": "",
+            "LOG_TO_CONSOLE": "false",
+            "PERF_SLOW_THRESHOLD_MS": "0",
+            "PERF_DUMP_INTERVAL": "0",
+            "PROJECT_READ_MODEL": "true" if read_model else "false",
+        }
+    )
+
+
+async def _seed(app: BotApp, users: int, admins: int, projects: int) -> Tuple[Dict[int, dict], List[int]]:
+    """Create admins and programmers bound to fake Telegram ids; returns profiles by telegram id and project ids."""
+    # سرویس‌های خود برنامه تا مدل خواندنی پروژه‌ها (در صورت فعال بودن) هم به‌روز شود
+    user_service = app.dp.workflow_data["user_service"]
+    project_service = app.dp.workflow_data["project_service"]
+    profiles: Dict[int, dict] = {}
+    for index in range(admins + users):
+        telegram_id = 1000 + index
+        role = "admin" if index < admins else "programmer"
+        name = f"{role}{index}"
+        user_id = await user_service.create_user(f"0912{index:07d}", name, role)
+        await user_service.update_telegram_id(user_id, telegram_id)
+        profiles[telegram_id] = {"name": name, "role": role, "projects": []}
+    programmers = [telegram_id for telegram_id, profile in profiles.items() if profile["role"] == "programmer"]
+    project_ids = []
+    for index in range(projects):
+        owner = profiles[programmers[index % len(programmers)]] if programmers else None
+        project = await project_service.create_project(
+            title=f"پروژه {index}",
+            description="load test",
+            status=random.choice(STATUSES),
+            owner_name=owner["name"] if owner else None,
+            start_date="2024-01-01",
+        )
+        project_ids.append(project["id"])
+        if owner:
+            owner["projects"].append(project["id"])
+    return profiles, project_ids
+
+
+def _flow_updates(
+    rng: random.Random,
+    flow: str,
+    telegram_id: int,
+    profile: dict,
+    admin_ids: List[int],
+    project_ids: List[int],
+) -> List[dict]:
+    own = profile["projects"] or project_ids
+    if flow == "start":
+        return [fake_update(telegram_id, f"/start project_{rng.choice(own)}")]
+    if flow == "list":
+        return [fake_update(telegram_id, "📊 وضعیت پروژه ها")]
+    if flow == "status":
+        project_id = rng.choice(own)
+        return [
+            _callback_update(telegram_id, ProjectActionCallback(project_id=project_id, action="status").pack()),
+            _callback_update(telegram_id, StatusCallback(value=rng.choice(STATUSES)).pack()),
+            fake_update(telegram_id, BACK_TO_MENU),
+        ]
+    return [_group_update(rng.choice(admin_ids), "/status")]
+
+
+def _percentiles(values: List[float]) -> Dict[str, float]:
+    ordered = sorted(values)
+
+    def pick(fraction: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 2)
+
+    return {"p50_ms": pick(0.50), "p95_ms": pick(0.95), "p99_ms": pick(0.99)}
+
+
+async def _drive(app: BotApp, args: argparse.Namespace, mix: Dict[str, float]) -> Tuple[Dict[str, List[float]], float]:
+    profiles, project_ids = await _seed(app, args.users, args.admins, args.projects)
+    admin_ids = [telegram_id for telegram_id, profile in profiles.items() if profile["role"] == "admin"]
+    flows = [flow for flow in FLOWS if mix[flow] > 0]
+    weights = [mix[flow] for flow in flows]
+    latencies: Dict[str, List[float]] = defaultdict(list)
+
+    async def virtual_user(telegram_id: int) -> None:
+        # هر کاربر مولد تصادفی خودش را دارد تا سناریوها مستقل از ترتیب اجرای تسک‌ها تکرارپذیر باشند
+        rng = random.Random(args.seed * 1_000_003 + telegram_id)
+        profile = profiles[telegram_id]
+        for _ in range(args.iterations):
+            flow = rng.choices(flows, weights)[0]
+            for raw in _flow_updates(rng, flow, telegram_id, profile, admin_ids, project_ids):
+                started = time.perf_counter()
+                await app.dp.feed_update(app.bot, Update.model_validate(raw))
+                latencies[flow].append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(virtual_user(telegram_id) for telegram_id in profiles))
+    return latencies, time.perf_counter() - started
+
+
+async def run(args: argparse.Namespace) -> dict:
+    random.seed(args.seed)
+    mix = _parse_mix(args.mix)
+    api = FakeBotAPI(latency_ms=args.api_latency_ms)
+    api_base = await api.start()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            workdir = Path(tmp)
+            _configure_env(workdir, api_base, args.read_model)
+            paths = AppPaths(logs_root=str(workdir / "logs"), session_cache=str(workdir / "session_cache.json"))
+            app = await build_app(Settings.load(), paths)
+            await app.dp.emit_startup(bot=app.bot)
+            try:
+                latencies, elapsed = await _drive(app, args, mix)
+                handlers = app.perf_recorder.snapshot()
+            finally:
+                await app.dp.emit_shutdown(bot=app.bot)
+                await app.dp.storage.close()
+                await app.bot.session.close()
+                await app.close()
+    finally:
+        await api.stop()
+
+    every = [value for values in latencies.values() for value in values]
+    return {
+        "args": {name: getattr(args, name) for name in COMPARABLE_ARGS},
+        "updates": len(every),
+        "elapsed_s": round(elapsed, 3),
+        "updates_per_s": round(len(every) / elapsed, 1),
+        **_percentiles(every),
+        "flows": {flow: {"updates": len(values), **_percentiles(values)} for flow, values in latencies.items()},
+        "api_calls": dict(api.calls),
+        "handlers": handlers,
+    }
+
+
+def _report(result: dict) -> None:
+    print(
+        f"updates={result['updates']} elapsed={result['elapsed_s']:.2f}s "
+        f"throughput={result['updates_per_s']:.0f}/s "
+        f"p50={result['p50_ms']:.1f}ms p95={result['p95_ms']:.1f}ms p99={result['p99_ms']:.1f}ms"
+    )
+    for flow, stats in sorted(result["flows"].items()):
+        print(
+            f"  {flow:<7} updates={stats['updates']:<6} "
+            f"p50={stats['p50_ms']:.1f}ms p95={stats['p95_ms']:.1f}ms p99={stats['p99_ms']:.1f}ms"
+        )
+    print(f"api calls={result['api_calls']}")
+    print("slowest handlers (p95):")
+    for row in result["handlers"][:5]:
+        print(
+            f"  {row['handler']:<36} p95={row['p95_ms']:.1f}ms "
+            f"db={row['db_calls']:.1f} queries/{row['db_ms']:.1f}ms api={row['api_calls']:.1f} calls/{row['api_ms']:.1f}ms"
+        )
+
+
+def _compare(result: dict, baseline: dict, tolerance: float) -> bool:
+    if baseline.get("args") != result["args"]:
+        print(f"warning: baseline was recorded with {baseline.get('args')}, this run used {result['args']}")
+    ok = True
+    floor = baseline["updates_per_s"] * (1 - tolerance)
+    if result["updates_per_s"] < floor:
+        print(f"REGRESSION throughput {result['updates_per_s']:.0f}/s < {floor:.0f}/s (baseline {baseline['updates_per_s']:.0f}/s)")
+        ok = False
+    ceiling = baseline["p95_ms"] * (1 + tolerance)
+    if result["p95_ms"] > ceiling:
+        print(f"REGRESSION p95 {result['p95_ms']:.1f}ms > {ceiling:.1f}ms (baseline {baseline['p95_ms']:.1f}ms)")
+        ok = False
+    if ok:
+        print(f"within {tolerance:.0%} of baseline ({baseline['updates_per_s']:.0f}/s, p95={baseline['p95_ms']:.1f}ms)")
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=50, help="programmers, each a concurrent virtual user")
+    parser.add_argument("--admins", type=int, default=5)
+    parser.add_argument("--projects", type=int, default=200)
+    parser.add_argument("--iterations", type=int, default=20, help="flows run by each virtual user")
+    parser.add_argument("--mix", default="start=1,list=1,status=1,group=1", help="flow weights")
+    parser.add_argument("--api-latency-ms", type=float, default=0.0, help="added to every fake Bot API response")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--read-model", action="store_true", help="serve project reads from PROJECT_READ_MODEL")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed regression, as a fraction")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    _report(result)
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(result, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"baseline saved to {args.baseline}")
+    if args.compare:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if not _compare(result, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
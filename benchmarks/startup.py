@@ -0,0 +1,71 @@
+"""Measure database startup: cold migration of an empty file and restarts of an up-to-date one.
+
+A restart normally hits the fingerprint fast path of Database.run_migrations; --no-fast-path
+clears the stored fingerprint before every restart to show the cost of the full scan.
+
+Run from the repository root:
+
+    python -m benchmarks.startup --repeat 50
+"""
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from core.constants import AppPaths
+from db.session import MIGRATIONS_FINGERPRINT, Database
+
+
+async def _start(path: str, migrations_dir: str) -> float:
+    """connect + run_migrations + close, as app startup does; returns milliseconds."""
+    started = time.perf_counter()
+    database = Database(path)
+    await database.connect()
+    await database.run_migrations(migrations_dir)
+    elapsed = (time.perf_counter() - started) * 1000
+    await database.close()
+    return elapsed
+
+
+async def _forget_fingerprint(path: str) -> None:
+    database = Database(path)
+    await database.execute("DELETE FROM schema_state WHERE key = ?", (MIGRATIONS_FINGERPRINT,))
+    await database.close()
+
+
+def _summary(label: str, samples: List[float]) -> str:
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return f"{label:<22} median={statistics.median(ordered):.2f}ms p95={p95:.2f}ms min={ordered[0]:.2f}ms"
+
+
+async def run(repeat: int, no_fast_path: bool) -> None:
+    migrations_dir = AppPaths().migrations_dir
+    cold: List[float] = []
+    restart: List[float] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for index in range(repeat):
+            path = str(Path(tmp) / f"cold{index}.db")
+            cold.append(await _start(path, migrations_dir))
+        path = str(Path(tmp) / "cold0.db")
+        for _ in range(repeat):
+            if no_fast_path:
+                await _forget_fingerprint(path)
+            restart.append(await _start(path, migrations_dir))
+    print(_summary("cold (empty file)", cold))
+    print(_summary("restart (full scan)" if no_fast_path else "restart (fast path)", restart))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--no-fast-path", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(run(args.repeat, args.no_fast_path))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Post synthetic Telegram updates to a running webhook and report acceptance latency.
+
+Start the bot with RUN_MODE=webhook (point TELEGRAM_API_BASE at benchmarks.fake_bot_api so replies
+do not reach Telegram), then run from the repository root:
+
+    python -m benchmarks.webhook_poster --url http://127.0.0.1:8080/webhook --secret <WEBHOOK_SECRET>
+"""
+import argparse
+import asyncio
+import itertools
+import random
+import statistics
+import time
+from typing import List, Optional
+
+from aiohttp import ClientSession
+
+_update_ids = itertools.count(1)
+
+
+def fake_update(user_id: int, text: str) -> dict:
+    """A private-chat text message update as Telegram would deliver it."""
+    update_id = next(_update_ids)
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": {"id": user_id, "type": "private", "first_name": f"user{user_id}"},
+            "from": {"id": user_id, "is_bot": False, "first_name": f"user{user_id}"},
+            "text": text,
+        },
+    }
+
+
+async def post_updates(
+    url: str,
+    updates: List[dict],
+    secret: Optional[str] = None,
+    concurrency: int = 32,
+) -> List[tuple]:
+    """POST every update; returns (status, seconds) per request."""
+    headers = {"X-Telegram-Bot-Api-Secret-Token": secret} if secret else {}
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    results: List[tuple] = []
+
+    async def post(session: ClientSession, update: dict) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            async with session.post(url, json=update, headers=headers) as response:
+                await response.read()
+                results.append((response.status, time.perf_counter() - started))
+
+    async with ClientSession() as session:
+        await asyncio.gather(*(post(session, update) for update in updates))
+    return results
+
+
+async def run(url: str, secret: Optional[str], count: int, users: int, concurrency: int, text: str) -> None:
+    updates = [fake_update(random.randrange(1, users + 1), text) for _ in range(count)]
+    started = time.perf_counter()
+    results = await post_updates(url, updates, secret=secret, concurrency=concurrency)
+    elapsed = time.perf_counter() - started
+    statuses = {}
+    for status, _ in results:
+        statuses[status] = statuses.get(status, 0) + 1
+    latencies = sorted(seconds * 1000 for _, seconds in results)
+    p99 = latencies[max(0, int(len(latencies) * 0.99) - 1)]
+    print(f"posted={len(results)} in {elapsed:.2f}s ({len(results) / elapsed:.0f} updates/s) statuses={statuses}")
+    print(f"accept latency mean={statistics.mean(latencies):.2f}ms p50={statistics.median(latencies):.2f}ms p99={p99:.2f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8080/webhook")
+    parser.add_argument("--secret", default=None)
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--text", default="/start")
+    args = parser.parse_args()
+    asyncio.run(run(args.url, args.secret, args.count, args.users, args.concurrency, args.text))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+
+from db.queries import register
+
+# (state, data, updated_at)
+_Record = Tuple[Optional[str], Dict[str, Any], float]
+
+GET_STATE = register("fsm.get", "SELECT state, data, updated_at FROM fsm_states WHERE key = ?")
+UPSERT_STATE = register(
+    "fsm.upsert",
+    """
+    INSERT INTO fsm_states(key, state, data, updated_at) VALUES (?, ?, ?, ?)
+    ON CONFLICT(key) DO UPDATE SET state = excluded.state, data = excluded.data, updated_at = excluded.updated_at
+    """,
+)
+DELETE_STATE = register("fsm.delete", "DELETE FROM fsm_states WHERE key = ?")
+DELETE_EXPIRED = register("fsm.delete_expired", "DELETE FROM fsm_states WHERE updated_at < ?")
+
+
+def _storage_key(key: StorageKey) -> str:
+    thread = "" if key.thread_id is None else key.thread_id
+    return f"{key.bot_id}:{key.chat_id}:{key.user_id}:{thread}:{key.destiny}"
+
+
+class SQLiteStorage(BaseStorage):
+    """
+    FSM storage persisted in the `fsm_states` table with a write-through LRU cache in front.
+    States untouched for `state_ttl` seconds are treated as abandoned and removed by compaction;
+    a `state_ttl` of 0 keeps states forever.
+    """
+
+    def __init__(
+        self,
+        database,
+        cache_size: int = 1024,
+        state_ttl: float = 86400.0,
+        compact_interval: float = 3600.0,
+    ) -> None:
+        self._db = database
+        self._cache: "OrderedDict[str, _Record]" = OrderedDict()
+        self._cache_size = max(1, cache_size)
+        self._state_ttl = max(0.0, state_ttl)
+        self._compact_interval = max(1.0, compact_interval)
+        self._compact_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self._compact_task is None and self._state_ttl:
+            self._compact_task = asyncio.create_task(self._compact_loop())
+
+    async def close(self) -> None:
+        # Dispatcher closes the storage on every polling shutdown; the Database stays open for reuse.
+        if self._compact_task is None:
+            return
+        self._compact_task.cancel()
+        try:
+            await self._compact_task
+        except asyncio.CancelledError:
+            pass
+        self._compact_task = None
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        state_name = state.state if isinstance(state, State) else state
+        _, data, _ = await self._load(key)
+        await self._store(key, state_name, data)
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        state, _, _ = await self._load(key)
+        return state
+
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        state, _, _ = await self._load(key)
+        await self._store(key, state, dict(data))
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        _, data, _ = await self._load(key)
+        return dict(data)
+
+    async def compact(self) -> int:
+        """Drop abandoned states from the table and the cache; returns the number of cache entries removed."""
+        if not self._state_ttl:
+            return 0
+        cutoff = time.time() - self._state_ttl
+        await self._db.execute(DELETE_EXPIRED, (cutoff,))
+        expired = [name for name, (_, _, updated_at) in self._cache.items() if updated_at < cutoff]
+        for name in expired:
+            self._cache.pop(name, None)
+        return len(expired)
+
+    async def _compact_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._compact_interval)
+            try:
+                await self.compact()
+            except Exception:
+                continue
+
+    async def _load(self, key: StorageKey) -> _Record:
+        name = _storage_key(key)
+        record = self._cache.get(name)
+        if record is None:
+            row = await self._db.fetchone(GET_STATE, (name,))
+            if row is None:
+                record = (None, {}, time.time())
+            else:
+                record = (row["state"], json.loads(row["data"] or "{}"), row["updated_at"])
+            self._remember(name, record)
+        else:
+            self._cache.move_to_end(name)
+        if self._is_expired(record):
+            record = (None, {}, time.time())
+            self._remember(name, record)
+        return record
+
+    async def _store(self, key: StorageKey, state: Optional[str], data: Dict[str, Any]) -> None:
+        name = _storage_key(key)
+        now = time.time()
+        if state is None and not data:
+            await self._db.execute(DELETE_STATE, (name,))
+        else:
+            await self._db.execute(
+                UPSERT_STATE,
+                (name, state, json.dumps(data, ensure_ascii=False), now),
+            )
+        self._remember(name, (state, data, now))
+
+    def _remember(self, name: str, record: _Record) -> None:
+        self._cache[name] = record
+        self._cache.move_to_end(name)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    def _is_expired(self, record: _Record) -> bool:
+        state, data, updated_at = record
+        if not self._state_ttl or (state is None and not data):
+            return False
+        return time.time() - updated_at > self._state_ttl
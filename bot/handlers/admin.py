@@ -1,7 +1,8 @@
-﻿from datetime import datetime
+﻿import html
+from datetime import datetime
 
 from aiogram import F, Router, types
-from aiogram.filters import StateFilter
+from aiogram.filters import Command, StateFilter
 from aiogram.fsm.context import FSMContext
 
 from bot.fsm.states import AdminCreateProject, AdminCreateUser
@@ -23,13 +24,13 @@ from bot.keyboards.reply import (
     owner_skip_keyboard,
     user_menu_keyboard,
 )
-from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError
 
 from bot.texts import fa
-from services.project_formatter import project_profile_text
 from core.constants import BACK_TO_MENU, SKIP_DESCRIPTION_BUTTON, SKIP_OWNER_BUTTON
 from services.logging_service import LogService
+from services.notification_service import NotificationService
 from services.menu_service import MenuService
+from services.perf_service import PerfRecorder
 from services.project_service import ProjectService
 from services.session_manager import SessionManager
 from services.user_service import UserService
@@ -37,6 +38,8 @@ from services.validators import is_valid_phone, parse_date, parse_version
 
 router = Router()
 
+PERF_TOP_HANDLERS = 15
+
 
 async def _ensure_admin(message: types.Message, session_manager: SessionManager, user_service: UserService):
     profile = await session_manager.ensure_profile(message.from_user.id, user_service)
@@ -68,16 +71,6 @@ async def _ensure_admin_callback(callback: types.CallbackQuery, session_manager:
     return profile
 
 
-async def _notify_group(bot, updates_group_id, project: dict, prefix: str) -> None:
-    if not updates_group_id:
-        return
-    text = f"{prefix}\n{project_profile_text(project)}"
-    try:
-        await bot.send_message(chat_id=updates_group_id, text=text)
-    except (TelegramBadRequest, TelegramForbiddenError):
-        pass
-
-
 @router.message(F.text == "👥 کاربرها")
 async def user_menu(
     message: types.Message,
@@ -92,6 +85,53 @@ async def user_menu(
     await message.answer("یکی از گزینه‌های کاربری را انتخاب کنید:", reply_markup=user_menu_keyboard())
 
 
+@router.message(Command("perf"))
+async def show_perf(
+    message: types.Message,
+    session_manager: SessionManager,
+    user_service: UserService,
+    perf_recorder: PerfRecorder,
+):
+    profile = await _ensure_admin(message, session_manager, user_service)
+    if not profile:
+        return
+    rows = perf_recorder.snapshot()[:PERF_TOP_HANDLERS]
+    if not rows:
+        await message.answer(fa.PERF_EMPTY)
+        return
+    lines = [f"{'handler':<32} {'n':>6} {'p50':>7} {'p95':>7} {'p99':>7} {'db':>4} {'db_ms':>6} {'api_ms':>6}"]
+    for row in rows:
+        lines.append(
+            f"{row['handler'][:32]:<32} {row['total']:>6} {row['p50_ms']:>7.1f} {row['p95_ms']:>7.1f} "
+            f"{row['p99_ms']:>7.1f} {row['db_calls']:>4.1f} {row['db_ms']:>6.1f} {row['api_ms']:>6.1f}"
+        )
+    table = html.escape("\n".join(lines))
+    await message.answer(f"{fa.PERF_TITLE}\n<pre>{table}</pre>")
+
+
+@router.message(Command("readmodel"))
+async def check_read_model(
+    message: types.Message,
+    session_manager: SessionManager,
+    user_service: UserService,
+    project_service: ProjectService,
+    log_service: LogService,
+):
+    profile = await _ensure_admin(message, session_manager, user_service)
+    if not profile:
+        return
+    mismatched = await project_service.verify_read_model()
+    if mismatched is None:
+        await message.answer(fa.READ_MODEL_DISABLED)
+        return
+    if not mismatched:
+        await message.answer(fa.READ_MODEL_CONSISTENT)
+        return
+    ids = ", ".join(str(project_id) for project_id in mismatched)
+    await log_service.error(f"مدل خواندنی پروژه‌ها با پایگاه داده ناهمخوان بود و دوباره بارگذاری شد (شناسه‌ها: {ids})")
+    await message.answer(fa.READ_MODEL_REPAIRED.format(count=len(mismatched)))
+
+
 @router.message(F.text == "📄 لیست کاربران")
 async def list_users(
     message: types.Message,
@@ -352,7 +392,7 @@ async def capture_start_date(
     log_service: LogService,
     menu_service: MenuService,
     user_service: UserService,
-    updates_group_id: int | None,
+    notification_service: NotificationService,
 ):
     if message.text == BACK_TO_MENU:
         await state.clear()
@@ -381,7 +421,7 @@ async def capture_start_date(
         await message.answer(fa.ASK_PROJECT_VERSION)
         return
     profile = await session_manager.ensure_profile(message.from_user.id, user_service)
-    project_id = await project_service.create_project(
+    new_project = await project_service.create_project(
         title=data.get("project_title"),
         description=data.get("project_description", ""),
         status=data.get("project_status"),
@@ -389,9 +429,8 @@ async def capture_start_date(
         start_date=formatted,
     )
     await log_service.info(f"ادمین {profile['name']} پروژه‌ای جدید ایجاد کرد ({data.get('project_title')})")
-    new_project = await project_service.get_project(project_id)
     if new_project:
-        await _notify_group(message.bot, updates_group_id, new_project, "پروژه جدید ایجاد شد")
+        notification_service.notify(new_project, "پروژه جدید ایجاد شد")
     await state.clear()
     await message.answer(fa.PROJECT_CREATED)
     await menu_service.show_main_menu(message, profile)
@@ -434,7 +473,7 @@ async def capture_project_version(
     log_service: LogService,
     menu_service: MenuService,
     user_service: UserService,
-    updates_group_id: int | None,
+    notification_service: NotificationService,
 ):
     version = parse_version(message.text)
     if not version:
@@ -446,7 +485,7 @@ async def capture_project_version(
     profile = await _ensure_admin(message, session_manager, user_service)
     if not profile:
         return
-    project_id = await project_service.create_project(
+    new_project = await project_service.create_project(
         title=data.get("project_title"),
         description=data.get("project_description", ""),
         status=data.get("project_status"),
@@ -457,9 +496,8 @@ async def capture_project_version(
         version_date=end_date,
     )
     await log_service.info(f"ادمین {profile['name']} پروژه‌ای جدید ایجاد کرد ({data.get('project_title')})")
-    new_project = await project_service.get_project(project_id)
     if new_project:
-        await _notify_group(message.bot, updates_group_id, new_project, "پروژه جدید ایجاد شد")
+        notification_service.notify(new_project, "پروژه جدید ایجاد شد")
     await state.clear()
     await message.answer(fa.PROJECT_CREATED)
     await menu_service.show_main_menu(message, profile)
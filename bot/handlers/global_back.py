@@ -3,7 +3,7 @@ from aiogram.fsm.context import FSMContext
 
 from bot.texts import fa
 from core.constants import BACK_TO_MENU
-from bot.utils.ui import cleanup_inline_messages
+from bot.utils.ui import InlineCleaner
 from services.menu_service import MenuService
 from services.session_manager import SessionManager
 from services.user_service import UserService
@@ -12,16 +12,12 @@ from bot.keyboards.reply import contact_request_keyboard
 router = Router(name="global_back_router")
 
 
-@router.message(F.text == BACK_TO_MENU)
-async def global_back_handler(
+async def _show_menu(
     message: types.Message,
-    state: FSMContext,
     session_manager: SessionManager,
     menu_service: MenuService,
     user_service: UserService,
-):
-    await state.clear()
-    await cleanup_inline_messages(message, session_manager)
+) -> None:
     profile = await session_manager.ensure_profile(message.from_user.id, user_service)
     if profile and not profile.get("active", 1):
         session_manager.clear_profile(message.from_user.id)
@@ -34,3 +30,22 @@ async def global_back_handler(
             await message.answer(fa.REQUEST_PHONE, reply_markup=contact_request_keyboard())
         else:
             await message.answer(fa.REQUEST_PHONE)
+
+
+@router.message(F.text == BACK_TO_MENU)
+async def global_back_handler(
+    message: types.Message,
+    state: FSMContext,
+    session_manager: SessionManager,
+    menu_service: MenuService,
+    user_service: UserService,
+    inline_cleaner: InlineCleaner,
+):
+    await state.clear()
+    message_ids = session_manager.consume_inline_messages(message.from_user.id)
+    if inline_cleaner.deferred:
+        await _show_menu(message, session_manager, menu_service, user_service)
+        inline_cleaner.schedule(message, message_ids)
+        return
+    await inline_cleaner.clear(message, message_ids)
+    await _show_menu(message, session_manager, menu_service, user_service)
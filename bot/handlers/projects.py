@@ -4,7 +4,7 @@ from html import escape
 from aiogram import F, Router, types
 from aiogram.filters import Command, StateFilter
 from aiogram.fsm.context import FSMContext
-from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError
+from aiogram.exceptions import TelegramBadRequest
 
 from bot.fsm.states import (
     ProjectDescriptionUpdate,
@@ -14,12 +14,14 @@ from bot.fsm.states import (
 )
 from bot.keyboards.inline import (
     GroupProjectCallback,
+    ProjectPageCallback,
     StatusFilterCallback,
     OwnerCallback,
     ProjectActionCallback,
     StatusCallback,
     delete_confirmation_keyboard,
     group_projects_keyboard,
+    project_links_keyboard,
     status_filter_keyboard,
     owner_keyboard,
     project_profile_keyboard,
@@ -27,8 +29,9 @@ from bot.keyboards.inline import (
 )
 from bot.keyboards.reply import back_keyboard, contact_request_keyboard
 from bot.texts import fa
-from core.constants import STATUS_LABELS
+from core.constants import PROJECTS_PAGE_SIZE, STATUS_LABELS
 from services.logging_service import LogService
+from services.notification_service import NotificationService
 from services.project_formatter import project_profile_text
 from services.project_service import ProjectService
 from services.session_manager import SessionManager
@@ -50,14 +53,13 @@ async def _send_profile(
     )
     session_manager.add_inline_message(message.from_user.id, sent.message_id)
 
-async def _notify_group(bot, updates_group_id, project: dict, prefix: str) -> None:
-    if not updates_group_id:
-        return
-    text = f"{prefix}\n{project_profile_text(project)}"
-    try:
-        await bot.send_message(chat_id=updates_group_id, text=text)
-    except (TelegramBadRequest, TelegramForbiddenError):
-        pass
+
+def _project_links_text(bot_username: str, projects) -> str:
+    items = [
+        f"• <a href=\"https://t.me/{bot_username}?start=project_{project['id']}\">{escape(project['title'])}</a>"
+        for project in projects
+    ]
+    return "\n".join([fa.UPDATE_SELECT_PROJECT, *items])
 
 
 async def _load_project(
@@ -105,22 +107,22 @@ async def show_project_links(
         session_manager.clear_profile(message.from_user.id)
         await message.answer(fa.USER_INACTIVE)
         return
-    projects = await project_service.list_for_updates(profile.get("role"), profile.get("name"))
-    if not projects:
+    page = await project_service.list_page(profile.get("role"), profile.get("name"), limit=PROJECTS_PAGE_SIZE)
+    if not page.items:
         if profile.get("role") == "admin":
             await message.answer(fa.NO_PROJECTS_AVAILABLE)
         else:
             await message.answer(fa.NO_PROJECT_ASSIGNED)
         return
-    items = [
-        f"• <a href=\"https://t.me/{bot_username}?start=project_{project['id']}\">{escape(project['title'])}</a>"
-        for project in projects
-    ]
-    response = "\n".join([fa.UPDATE_SELECT_PROJECT, *items])
-    await message.answer(response, disable_web_page_preview=True)
+    await message.answer(
+        _project_links_text(bot_username, page.items),
+        disable_web_page_preview=True,
+        reply_markup=project_links_keyboard(page),
+    )
+    counts = await project_service.status_counts(profile.get("role"), profile.get("name"))
     await message.answer(
         "فیلتر بر اساس وضعیت:",
-        reply_markup=status_filter_keyboard(),
+        reply_markup=status_filter_keyboard(counts),
     )
     await log_service.info(f"{profile['name']} فهرست پروژه‌ها را مشاهده کرد")
 
@@ -140,17 +142,18 @@ async def group_status(
     profile = await session_manager.ensure_profile(message.from_user.id, user_service)
     if not profile or profile.get("role") != "admin":
         return
-    projects = await project_service.list_for_updates("admin", None)
-    if not projects:
+    page = await project_service.list_page("admin", None, limit=PROJECTS_PAGE_SIZE)
+    if not page.items:
         await message.answer(fa.NO_PROJECTS_AVAILABLE)
         return
     await message.answer(
         fa.UPDATE_SELECT_PROJECT,
-        reply_markup=group_projects_keyboard(projects),
+        reply_markup=group_projects_keyboard(page.items, page),
     )
+    counts = await project_service.status_counts("admin", None)
     await message.answer(
         "فیلتر بر اساس وضعیت:",
-        reply_markup=status_filter_keyboard(),
+        reply_markup=status_filter_keyboard(counts),
     )
     await log_service.info(f"{profile['name']} فهرست پروژه‌ها را در گروه {message.chat.id} ارسال کرد")
 
@@ -246,7 +249,7 @@ async def update_status(
     session_manager: SessionManager,
     log_service: LogService,
     user_service: UserService,
-    updates_group_id: int | None,
+    notification_service: NotificationService,
 ):
     data = await state.get_data()
     project_id = data.get("edit_project_id")
@@ -277,10 +280,9 @@ async def update_status(
         await callback.message.answer(fa.ASK_PROJECT_VERSION)
         await callback.answer()
         return
-    await project_service.update_status(project_id, callback_data.value)
-    updated = await project_service.get_project(project_id)
+    updated = await project_service.update_status(project_id, callback_data.value)
     await log_service.info(f"{profile['name']} وضعیت پروژه {project_id} را به‌روزرسانی کرد")
-    await _notify_group(callback.message.bot, updates_group_id, updated, "پروژه آپدیت شد")
+    notification_service.notify(updated, "پروژه آپدیت شد")
     await state.clear()
     await callback.answer("✅ تغییر انجام شد")
     await callback.message.answer(fa.STATUS_UPDATED)
@@ -333,7 +335,7 @@ async def capture_status_version(
     session_manager: SessionManager,
     log_service: LogService,
     user_service: UserService,
-    updates_group_id: int | None,
+    notification_service: NotificationService,
 ):
     version = parse_version(message.text)
     if not version:
@@ -356,16 +358,15 @@ async def capture_status_version(
     )
     if not project:
         return
-    await project_service.update_status(
+    updated = await project_service.update_status(
         project_id,
         "done",
         end_date=end_date,
         version=version,
         version_date=end_date,
     )
-    updated = await project_service.get_project(project_id)
     await log_service.info(f"{profile['name']} وضعیت پروژه {project_id} را به‌روزرسانی کرد")
-    await _notify_group(message.bot, updates_group_id, updated, "پروژه آپدیت شد")
+    notification_service.notify(updated, "پروژه آپدیت شد")
     await state.clear()
     await message.answer(fa.STATUS_UPDATED)
     await _send_profile(message, updated, profile, session_manager)
@@ -379,7 +380,7 @@ async def apply_new_title(
     session_manager: SessionManager,
     log_service: LogService,
     user_service: UserService,
-    updates_group_id: int | None,
+    notification_service: NotificationService,
 ):
     title = message.text.strip()
     if len(title) < 3:
@@ -397,10 +398,9 @@ async def apply_new_title(
     )
     if not project:
         return
-    await project_service.update_title(project_id, title)
+    updated = await project_service.update_title(project_id, title)
     await log_service.info(f"{profile['name']} عنوان پروژه {project_id} را تغییر داد")
-    updated = await project_service.get_project(project_id)
-    await _notify_group(message.bot, updates_group_id, updated, "پروژه آپدیت شد")
+    notification_service.notify(updated, "پروژه آپدیت شد")
     await state.clear()
     await message.answer(fa.TITLE_UPDATED)
     await _send_profile(message, updated, profile, session_manager)
@@ -414,7 +414,7 @@ async def apply_new_description(
     session_manager: SessionManager,
     log_service: LogService,
     user_service: UserService,
-    updates_group_id: int | None,
+    notification_service: NotificationService,
 ):
     description = message.text.strip()
     data = await state.get_data()
@@ -429,10 +429,9 @@ async def apply_new_description(
     )
     if not project:
         return
-    await project_service.update_description(project_id, description)
+    updated = await project_service.update_description(project_id, description)
     await log_service.info(f"{profile['name']} توضیحات پروژه {project_id} را تغییر داد")
-    updated = await project_service.get_project(project_id)
-    await _notify_group(message.bot, updates_group_id, updated, "پروژه آپدیت شد")
+    notification_service.notify(updated, "پروژه آپدیت شد")
     await state.clear()
     await message.answer(fa.DESCRIPTION_UPDATED)
     await _send_profile(message, updated, profile, session_manager)
@@ -447,7 +446,7 @@ async def update_owner(
     project_service: ProjectService,
     session_manager: SessionManager,
     log_service: LogService,
-    updates_group_id: int | None,
+    notification_service: NotificationService,
 ):
     profile = await session_manager.ensure_profile(callback.from_user.id, user_service)
     if not profile:
@@ -466,10 +465,9 @@ async def update_owner(
         return
     data = await state.get_data()
     project_id = data.get("edit_project_id")
-    await project_service.update_owner(project_id, user["name"])
+    updated = await project_service.update_owner(project_id, user["name"])
     await log_service.info(f"{profile['name']} مسئول پروژه {project_id} را به {user['name']} تغییر داد")
-    updated = await project_service.get_project(project_id)
-    await _notify_group(callback.message.bot, updates_group_id, updated, "پروژه آپدیت شد")
+    notification_service.notify(updated, "پروژه آپدیت شد")
     await state.clear()
     await callback.answer("✅ مسئول تغییر کرد")
     await callback.message.answer(fa.OWNER_UPDATED)
@@ -495,6 +493,56 @@ async def show_group_project(
     await callback.message.answer(project_profile_text(project))
 
 
+@router.callback_query(ProjectPageCallback.filter())
+async def turn_project_page(
+    callback: types.CallbackQuery,
+    callback_data: ProjectPageCallback,
+    project_service: ProjectService,
+    session_manager: SessionManager,
+    user_service: UserService,
+    bot_username: str,
+):
+    chat = callback.message.chat if callback.message else None
+    if not chat:
+        await callback.answer()
+        return
+    profile = await session_manager.ensure_profile(callback.from_user.id, user_service)
+    if callback_data.scope == "group":
+        if chat.type not in {"group", "supergroup"} or not profile or profile.get("role") != "admin":
+            await callback.answer()
+            return
+        role, owner_name = "admin", None
+    else:
+        if not profile:
+            await callback.answer(fa.REQUEST_PHONE, show_alert=True)
+            return
+        role, owner_name = profile.get("role"), profile.get("name")
+    page = await project_service.list_page(
+        role,
+        owner_name,
+        cursor=callback_data.cursor,
+        limit=PROJECTS_PAGE_SIZE,
+        backward=callback_data.direction == "prev",
+        status=callback_data.status,
+    )
+    await callback.answer()
+    if not page.items:
+        return
+    try:
+        if callback_data.scope == "group":
+            await callback.message.edit_reply_markup(
+                reply_markup=group_projects_keyboard(page.items, page, callback_data.status)
+            )
+        else:
+            await callback.message.edit_text(
+                _project_links_text(bot_username, page.items),
+                disable_web_page_preview=True,
+                reply_markup=project_links_keyboard(page, callback_data.status),
+            )
+    except TelegramBadRequest:
+        pass
+
+
 @router.callback_query(StatusFilterCallback.filter())
 async def handle_status_filter(
     callback: types.CallbackQuery,
@@ -513,32 +561,36 @@ async def handle_status_filter(
         if not profile or profile.get("role") != "admin":
             await callback.answer()
             return
-        projects = await project_service.list_for_updates("admin", None)
-        filtered = [p for p in projects if p.get("status") == callback_data.status]
-        if not filtered:
+        page = await project_service.list_page(
+            "admin", None, limit=PROJECTS_PAGE_SIZE, status=callback_data.status
+        )
+        if not page.items:
             await callback.answer(fa.NO_PROJECTS_IN_STATUS, show_alert=True)
             return
         await callback.answer()
         await callback.message.answer(
             f"📌 پروژه‌های {STATUS_LABELS.get(callback_data.status, callback_data.status)}:",
-            reply_markup=group_projects_keyboard(filtered),
+            reply_markup=group_projects_keyboard(page.items, page, callback_data.status),
         )
         return
     profile = await session_manager.ensure_profile(callback.from_user.id, user_service)
     if not profile:
         await callback.answer(fa.REQUEST_PHONE, show_alert=True)
         return
-    projects = await project_service.list_for_updates(profile.get("role"), profile.get("name"))
-    filtered = [p for p in projects if p.get("status") == callback_data.status]
-    if not filtered:
+    page = await project_service.list_page(
+        profile.get("role"),
+        profile.get("name"),
+        limit=PROJECTS_PAGE_SIZE,
+        status=callback_data.status,
+    )
+    if not page.items:
         await callback.answer(fa.NO_PROJECTS_IN_STATUS, show_alert=True)
         return
-    items = [
-        f"• <a href=\"https://t.me/{bot_username}?start=project_{proj['id']}\">{escape(proj['title'])}</a>"
-        for proj in filtered
-    ]
-    text = "\n".join([fa.UPDATE_SELECT_PROJECT, *items])
     await callback.answer()
-    await callback.message.answer(text, disable_web_page_preview=True)
+    await callback.message.answer(
+        _project_links_text(bot_username, page.items),
+        disable_web_page_preview=True,
+        reply_markup=project_links_keyboard(page, callback_data.status),
+    )
 
 
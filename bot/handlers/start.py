@@ -46,15 +46,10 @@ async def _resolve_profile(
     session_manager: SessionManager,
     user_service: UserService,
 ) -> tuple[Optional[dict], bool]:
-    profile = session_manager.get_profile(user_id)
-    db_user = await user_service.get_by_telegram(user_id)
-    if not db_user or not db_user.get("active", 1):
-        if profile:
-            session_manager.clear_profile(user_id)
-        return None, True if profile else False
-    if not profile or profile != db_user:
-        session_manager.set_profile(user_id, db_user)
-        return db_user, False
+    had_profile = session_manager.get_profile(user_id) is not None
+    profile = await session_manager.ensure_profile(user_id, user_service)
+    if not profile:
+        return None, had_profile
     return profile, False
 
 
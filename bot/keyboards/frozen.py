@@ -0,0 +1,16 @@
+from pydantic import ConfigDict
+from aiogram.types import InlineKeyboardMarkup, ReplyKeyboardMarkup
+
+
+class FrozenInlineKeyboardMarkup(InlineKeyboardMarkup):
+    """Markup shared between handlers through the keyboard caches; assigning fields raises."""
+
+    model_config = ConfigDict(**{**InlineKeyboardMarkup.model_config, "frozen": True})
+
+
+class FrozenReplyKeyboardMarkup(ReplyKeyboardMarkup):
+    model_config = ConfigDict(**{**ReplyKeyboardMarkup.model_config, "frozen": True})
+
+
+def freeze_inline(markup: InlineKeyboardMarkup) -> FrozenInlineKeyboardMarkup:
+    return FrozenInlineKeyboardMarkup(inline_keyboard=markup.inline_keyboard)
@@ -1,7 +1,11 @@
-﻿from aiogram.filters.callback_data import CallbackData
-from aiogram.types import InlineKeyboardMarkup
+﻿from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from aiogram.filters.callback_data import CallbackData
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
+from bot.keyboards.frozen import freeze_inline
 from core.constants import ROLES, VISIBLE_STATUSES, STATUS_LABELS
 
 
@@ -35,6 +39,16 @@ class StatusFilterCallback(CallbackData, prefix="statusfilter"):
     status: str
 
 
+class ProjectPageCallback(CallbackData, prefix="ppage"):
+    scope: str
+    direction: str
+    cursor: int
+    # وضعیت فیلترشده؛ خالی یعنی همه پروژه‌ها
+    status: Optional[str] = None
+
+
+# کیبوردهایی که فقط به ثابت‌ها یا یک شناسه وابسته‌اند یک بار ساخته و به‌صورت فریزشده بازاستفاده می‌شوند
+@lru_cache(maxsize=1)
 def role_keyboard() -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
     for role in ROLES:
@@ -42,9 +56,10 @@ def role_keyboard() -> InlineKeyboardMarkup:
         builder.button(text=label, callback_data=RoleCallback(value=role))
         
     builder.adjust(2)
-    return builder.as_markup()
+    return freeze_inline(builder.as_markup())
 
 
+@lru_cache(maxsize=1)
 def status_keyboard() -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
     for status in VISIBLE_STATUSES:
@@ -53,7 +68,7 @@ def status_keyboard() -> InlineKeyboardMarkup:
             callback_data=StatusCallback(value=status),
         )
     builder.adjust(2)
-    return builder.as_markup()
+    return freeze_inline(builder.as_markup())
 
 
 def owner_keyboard(users) -> InlineKeyboardMarkup:
@@ -67,6 +82,7 @@ def owner_keyboard(users) -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@lru_cache(maxsize=1024)
 def project_profile_keyboard(project_id: int, is_admin: bool) -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
     builder.button(
@@ -91,9 +107,10 @@ def project_profile_keyboard(project_id: int, is_admin: bool) -> InlineKeyboardM
             callback_data=ProjectActionCallback(project_id=project_id, action="delete"),
         )
     builder.adjust(1)
-    return builder.as_markup()
+    return freeze_inline(builder.as_markup())
 
 
+@lru_cache(maxsize=256)
 def delete_confirmation_keyboard(project_id: int) -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
     builder.button(
@@ -105,7 +122,7 @@ def delete_confirmation_keyboard(project_id: int) -> InlineKeyboardMarkup:
         callback_data=ProjectActionCallback(project_id=project_id, action="delete_cancel"),
     )
     builder.adjust(1)
-    return builder.as_markup()
+    return freeze_inline(builder.as_markup())
 
 
 def user_list_keyboard(users) -> InlineKeyboardMarkup:
@@ -120,6 +137,7 @@ def user_list_keyboard(users) -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@lru_cache(maxsize=256)
 def user_profile_keyboard(user_id: int, is_active: bool) -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
     action = "deactivate" if is_active else "activate"
@@ -128,10 +146,29 @@ def user_profile_keyboard(user_id: int, is_active: bool) -> InlineKeyboardMarkup
         text=label,
         callback_data=UserActionCallback(user_id=user_id, action=action),
     )
-    return builder.as_markup()
+    return freeze_inline(builder.as_markup())
 
 
-def group_projects_keyboard(projects) -> InlineKeyboardMarkup:
+def _page_navigation(page, scope: str, status: Optional[str] = None) -> list:
+    buttons = []
+    if page.has_prev:
+        buttons.append(
+            InlineKeyboardButton(
+                text="◀️ قبلی",
+                callback_data=ProjectPageCallback(scope=scope, direction="prev", cursor=page.first_id, status=status).pack(),
+            )
+        )
+    if page.has_next:
+        buttons.append(
+            InlineKeyboardButton(
+                text="بعدی ▶️",
+                callback_data=ProjectPageCallback(scope=scope, direction="next", cursor=page.last_id, status=status).pack(),
+            )
+        )
+    return buttons
+
+
+def group_projects_keyboard(projects, page=None, status: Optional[str] = None) -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
     for project in projects:
         builder.button(
@@ -139,15 +176,36 @@ def group_projects_keyboard(projects) -> InlineKeyboardMarkup:
             callback_data=GroupProjectCallback(project_id=project["id"]),
         )
     builder.adjust(1)
+    if page is not None:
+        navigation = _page_navigation(page, "group", status)
+        if navigation:
+            builder.row(*navigation)
     return builder.as_markup()
 
 
-def status_filter_keyboard() -> InlineKeyboardMarkup:
+def project_links_keyboard(page, status: Optional[str] = None) -> Optional[InlineKeyboardMarkup]:
+    navigation = _page_navigation(page, "links", status)
+    if not navigation:
+        return None
+    return InlineKeyboardMarkup(inline_keyboard=[navigation])
+
+
+def status_filter_keyboard(counts: Optional[Dict[str, int]] = None) -> InlineKeyboardMarkup:
+    if counts is None:
+        return _status_filter_markup(None)
+    return _status_filter_markup(tuple(counts.get(status, 0) for status in VISIBLE_STATUSES))
+
+
+@lru_cache(maxsize=64)
+def _status_filter_markup(counts: Optional[Tuple[int, ...]]) -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
-    for status in VISIBLE_STATUSES:
+    for index, status in enumerate(VISIBLE_STATUSES):
+        label = STATUS_LABELS.get(status, status)
+        if counts is not None:
+            label = f"{label} ({counts[index]})"
         builder.button(
-            text=STATUS_LABELS.get(status, status),
+            text=label,
             callback_data=StatusFilterCallback(status=status),
         )
     builder.adjust(2)
-    return builder.as_markup()
+    return freeze_inline(builder.as_markup())
@@ -1,5 +1,8 @@
+from functools import lru_cache
+
 from aiogram.types import KeyboardButton, ReplyKeyboardMarkup
 
+from bot.keyboards.frozen import FrozenReplyKeyboardMarkup
 from core.constants import (
     ADMIN_MENU_BUTTONS,
     USER_MENU_BUTTONS,
@@ -11,14 +14,17 @@ from core.constants import (
 )
 
 
+# منوها فقط به ثابت‌ها وابسته‌اند؛ هر کیبورد یک بار ساخته و فریزشده بازاستفاده می‌شود
+@lru_cache(maxsize=1)
 def contact_request_keyboard() -> ReplyKeyboardMarkup:
-    return ReplyKeyboardMarkup(
+    return FrozenReplyKeyboardMarkup(
         keyboard=[[KeyboardButton(text=REQUEST_PHONE_BUTTON, request_contact=True)]],
         resize_keyboard=True,
         one_time_keyboard=True,
     )
 
 
+@lru_cache(maxsize=1)
 def admin_menu_keyboard() -> ReplyKeyboardMarkup:
     rows = [
         [
@@ -28,32 +34,36 @@ def admin_menu_keyboard() -> ReplyKeyboardMarkup:
         [KeyboardButton(text=ADMIN_MENU_BUTTONS[2])],
         [KeyboardButton(text=ADMIN_MENU_BUTTONS[3])],
     ]
-    return ReplyKeyboardMarkup(keyboard=rows, resize_keyboard=True)
+    return FrozenReplyKeyboardMarkup(keyboard=rows, resize_keyboard=True)
 
 
+@lru_cache(maxsize=1)
 def user_menu_keyboard() -> ReplyKeyboardMarkup:
     rows = [
         [KeyboardButton(text=USER_MENU_BUTTONS[0])],
         [KeyboardButton(text=USER_MENU_BUTTONS[1])],
         [KeyboardButton(text=USER_MENU_BUTTONS[2])],
     ]
-    return ReplyKeyboardMarkup(keyboard=rows, resize_keyboard=True)
+    return FrozenReplyKeyboardMarkup(keyboard=rows, resize_keyboard=True)
 
 
+@lru_cache(maxsize=1)
 def programmer_menu_keyboard() -> ReplyKeyboardMarkup:
     rows = [[KeyboardButton(text=text)] for text in PROGRAMMER_MENU_BUTTONS]
-    return ReplyKeyboardMarkup(keyboard=rows, resize_keyboard=True)
+    return FrozenReplyKeyboardMarkup(keyboard=rows, resize_keyboard=True)
 
 
+@lru_cache(maxsize=1)
 def back_keyboard() -> ReplyKeyboardMarkup:
-    return ReplyKeyboardMarkup(
+    return FrozenReplyKeyboardMarkup(
         keyboard=[[KeyboardButton(text=BACK_TO_MENU)]],
         resize_keyboard=True,
     )
 
 
+@lru_cache(maxsize=1)
 def owner_skip_keyboard() -> ReplyKeyboardMarkup:
-    return ReplyKeyboardMarkup(
+    return FrozenReplyKeyboardMarkup(
         keyboard=[
             [KeyboardButton(text=SKIP_OWNER_BUTTON)],
             [KeyboardButton(text=BACK_TO_MENU)],
@@ -62,8 +72,9 @@ def owner_skip_keyboard() -> ReplyKeyboardMarkup:
     )
 
 
+@lru_cache(maxsize=1)
 def description_keyboard() -> ReplyKeyboardMarkup:
-    return ReplyKeyboardMarkup(
+    return FrozenReplyKeyboardMarkup(
         keyboard=[
             [KeyboardButton(text=SKIP_DESCRIPTION_BUTTON)],
             [KeyboardButton(text=BACK_TO_MENU)],
@@ -0,0 +1,81 @@
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware, Bot, Dispatcher
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.methods.base import Response, TelegramMethod, TelegramType
+from aiogram.types import TelegramObject
+
+from core.perf import Trace, current_trace, record_api
+from services.perf_service import PerfRecorder
+
+Handler = Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]]
+
+_HANDLERS_PACKAGE = "bot.handlers."
+
+
+def handler_name(callback: Callable) -> str:
+    """`projects.update_status` for bot.handlers.projects.update_status."""
+    module = getattr(callback, "__module__", None) or ""
+    if module.startswith(_HANDLERS_PACKAGE):
+        module = module[len(_HANDLERS_PACKAGE):]
+    name = getattr(callback, "__qualname__", None) or type(callback).__name__
+    return f"{module}.{name}" if module else name
+
+
+class UpdateMetrics(BaseMiddleware):
+    """
+    Outer update middleware: opens a trace for the update and hands its wall time to the recorder.
+    Register it after UpdateScheduler so time spent waiting for a slot is not counted.
+    Updates that no handler took are not recorded.
+    """
+
+    def __init__(self, recorder: PerfRecorder) -> None:
+        self._recorder = recorder
+
+    async def __call__(self, handler: Handler, event: TelegramObject, data: Dict[str, Any]) -> Any:
+        trace = Trace()
+        token = current_trace.set(trace)
+        started = time.perf_counter()
+        try:
+            return await handler(event, data)
+        finally:
+            wall = time.perf_counter() - started
+            current_trace.reset(token)
+            if trace.handler is not None:
+                await self._recorder.record(trace, wall)
+
+
+class HandlerNamer(BaseMiddleware):
+    """Inner middleware: tags the current trace with the handler that is about to run."""
+
+    async def __call__(self, handler: Handler, event: TelegramObject, data: Dict[str, Any]) -> Any:
+        trace = current_trace.get()
+        handler_object = data.get("handler")
+        if trace is not None and handler_object is not None:
+            trace.handler = handler_name(handler_object.callback)
+        return await handler(event, data)
+
+
+class ApiTimer(BaseRequestMiddleware):
+    """Bot session middleware: adds every Bot API call made while a handler runs to its trace."""
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        started = time.perf_counter()
+        try:
+            return await make_request(bot, method)
+        finally:
+            record_api(time.perf_counter() - started)
+
+
+def setup_metrics(dp: Dispatcher, bot: Bot, recorder: PerfRecorder) -> None:
+    dp.update.outer_middleware(UpdateMetrics(recorder))
+    namer = HandlerNamer()
+    dp.message.middleware(namer)
+    dp.callback_query.middleware(namer)
+    bot.session.middleware(ApiTimer())
@@ -0,0 +1,92 @@
+import asyncio
+import contextlib
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.fsm.storage.base import BaseEventIsolation, StorageKey
+from aiogram.types import TelegramObject
+
+OVERLOAD_POLICIES = ("queue", "shed")
+
+Handler = Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]]
+
+
+class UserEventIsolation(BaseEventIsolation):
+    """
+    Events isolation for the Dispatcher: updates with the same FSM key (user in chat) run one at a
+    time in arrival order. aiogram reads the FSM state only after this lock is taken, so a queued
+    update is routed with the state its predecessor left. Unlike SimpleEventIsolation, a key's
+    lock is dropped once no update holds or waits for it.
+    """
+
+    def __init__(self) -> None:
+        self._locks: Dict[StorageKey, asyncio.Lock] = {}
+        self._waiters: Dict[StorageKey, int] = {}
+
+    @contextlib.asynccontextmanager
+    async def lock(self, key: StorageKey) -> AsyncIterator[None]:
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            remaining = self._waiters[key] - 1
+            if remaining:
+                self._waiters[key] = remaining
+            else:
+                del self._waiters[key]
+                del self._locks[key]
+
+    async def close(self) -> None:
+        self._locks.clear()
+        self._waiters.clear()
+
+
+class UpdateScheduler(BaseMiddleware):
+    """
+    Outer update middleware capping the handlers that run at once at `max_concurrency`.
+    Per-user ordering comes from UserEventIsolation, which aiogram applies before this middleware
+    runs; `pending` therefore counts updates waiting for a free slot. Once `max_pending` of them
+    are waiting, `shed` drops new ones while `queue` keeps them waiting; 0 means no limit.
+    """
+
+    def __init__(self, max_concurrency: int = 32, max_pending: int = 1000, overload_policy: str = "queue") -> None:
+        if overload_policy not in OVERLOAD_POLICIES:
+            raise ValueError(f"سیاست بار اضافه باید یکی از {', '.join(OVERLOAD_POLICIES)} باشد.")
+        self._slots = asyncio.Semaphore(max(1, max_concurrency))
+        self._max_pending = max(0, max_pending)
+        self._overload_policy = overload_policy
+        self._pending = 0
+        self._running = 0
+        self._counters = {"handled": 0, "shed": 0, "peak_pending": 0, "peak_running": 0}
+
+    def stats(self) -> Dict[str, int]:
+        return {**self._counters, "pending": self._pending, "running": self._running}
+
+    def _overloaded(self) -> bool:
+        return self._overload_policy == "shed" and 0 < self._max_pending <= self._pending
+
+    async def __call__(self, handler: Handler, event: TelegramObject, data: Dict[str, Any]) -> Any:
+        if self._overloaded():
+            self._counters["shed"] += 1
+            return None
+        self._pending += 1
+        self._counters["peak_pending"] = max(self._counters["peak_pending"], self._pending)
+        started = False
+        try:
+            async with self._slots:
+                self._pending -= 1
+                started = True
+                self._running += 1
+                self._counters["peak_running"] = max(self._counters["peak_running"], self._running)
+                try:
+                    return await handler(event, data)
+                finally:
+                    self._running -= 1
+                    self._counters["handled"] += 1
+        finally:
+            if not started:
+                self._pending -= 1
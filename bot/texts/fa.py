@@ -47,3 +47,8 @@ DELETE_CANCELLED = "حذف پروژه لغو شد."
 GROUP_ID_RESPONSE = "شناسه این گروه: <code>{chat_id}</code>"
 GROUP_ID_COMMAND_DISABLED = "این دستور در حال حاضر غیرفعال است."
 GROUP_ID_GROUP_ONLY = "این دستور فقط در گروه‌ها قابل استفاده است."
+PERF_EMPTY = "هنوز آماری از زمان پاسخ هندلرها ثبت نشده است."
+PERF_TITLE = "⏱ کندترین هندلرها (بر حسب p95، زمان‌ها به میلی‌ثانیه):"
+READ_MODEL_DISABLED = "مدل خواندنی پروژه‌ها فعال نیست (PROJECT_READ_MODEL)."
+READ_MODEL_CONSISTENT = "✅ مدل خواندنی پروژه‌ها با پایگاه داده همخوان است."
+READ_MODEL_REPAIRED = "⚠️ {count} پروژه در مدل خواندنی با پایگاه داده همخوان نبود؛ مدل دوباره از پایگاه داده بارگذاری شد."
@@ -1,19 +1,88 @@
+import asyncio
+import logging
+from typing import Dict, List, Set
+
 from aiogram import types
-from aiogram.exceptions import TelegramBadRequest
-
-from services.session_manager import SessionManager
-
-
-async def cleanup_inline_messages(message: types.Message, session_manager: SessionManager) -> None:
-    message_ids = session_manager.consume_inline_messages(message.from_user.id)
-    if not message_ids:
-        return
-    for msg_id in message_ids:
-        try:
-            await message.bot.edit_message_reply_markup(
-                chat_id=message.chat.id,
-                message_id=msg_id,
-                reply_markup=None,
-            )
-        except TelegramBadRequest:
-            continue
\ No newline at end of file
+from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
+
+from core.perf import detached_context
+from core.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+
+class InlineCleaner:
+    """
+    Removes inline keyboards from tracked messages with at most `concurrency` edits in flight
+    and `rate` edits per second in each chat, so one chat's cleanup never waits behind
+    another's. In deferred mode the edits run in the background after the handler has replied.
+    """
+
+    def __init__(self, concurrency: int = 5, rate: float = 20.0, deferred: bool = False) -> None:
+        self.deferred = deferred
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._rate = rate
+        self._burst = max(1, concurrency)
+        self._buckets: Dict[int, TokenBucket] = {}
+        self._prune_at = 64
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def clear(self, message: types.Message, message_ids: List[int]) -> None:
+        if not message_ids:
+            return
+        await asyncio.gather(*(self._clear_one(message, msg_id) for msg_id in message_ids))
+
+    def schedule(self, message: types.Message, message_ids: List[int]) -> None:
+        if not message_ids:
+            return
+        # trace هندلر پیش از اجرای این task بسته و ثبت شده است؛ زمان این ویرایش‌ها نباید به آن اضافه شود
+        task = detached_context().run(asyncio.create_task, self.clear(message, message_ids))
+        self._tasks.add(task)
+        task.add_done_callback(self._on_done)
+
+    def _on_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            logger.error("حذف کیبورد پیام‌های قبلی در پس‌زمینه با خطا مواجه شد: %r", exc)
+
+    async def close(self) -> None:
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _bucket(self, chat_id: int) -> TokenBucket:
+        bucket = self._buckets.get(chat_id)
+        if bucket is None:
+            if len(self._buckets) >= self._prune_at:
+                # سطل پرشده معادل سطل تازه است؛ حذفش محدودیت هیچ گفتگویی را تغییر نمی‌دهد
+                self._buckets = {key: value for key, value in self._buckets.items() if not value.idle}
+                self._prune_at = max(64, 2 * len(self._buckets))
+            bucket = self._buckets[chat_id] = TokenBucket(self._rate, self._burst)
+        return bucket
+
+    async def _clear_one(self, message: types.Message, msg_id: int) -> None:
+        # انتظار برای سهمیه گفتگو بیرون از semaphore است تا جای ویرایش گفتگوهای دیگر را نگیرد
+        await self._bucket(message.chat.id).acquire()
+        async with self._semaphore:
+            try:
+                await message.bot.edit_message_reply_markup(
+                    chat_id=message.chat.id,
+                    message_id=msg_id,
+                    reply_markup=None,
+                )
+            except TelegramRetryAfter as exc:
+                # یک تلاش دوباره کافی است؛ کیبورد باقی‌مانده با بررسی‌های هندلر بی‌اثر است
+                await asyncio.sleep(exc.retry_after)
+                try:
+                    await message.bot.edit_message_reply_markup(
+                        chat_id=message.chat.id,
+                        message_id=msg_id,
+                        reply_markup=None,
+                    )
+                except (TelegramBadRequest, TelegramRetryAfter):
+                    pass
+            except TelegramBadRequest:
+                pass
+
@@ -0,0 +1,99 @@
+import asyncio
+import signal
+from typing import Any, Dict, Optional
+
+from aiohttp import web
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+
+from core.config import Settings
+
+
+class DrainingRequestHandler(SimpleRequestHandler):
+    """
+    Acknowledges every update immediately and processes at most `max_concurrency` of them at once.
+    On shutdown new requests get 503 (Telegram redelivers them later) while in-flight updates
+    are given `drain_timeout` seconds to finish.
+    """
+
+    def __init__(
+        self,
+        dispatcher: Dispatcher,
+        bot: Bot,
+        secret_token: Optional[str] = None,
+        max_concurrency: int = 64,
+        drain_timeout: float = 30.0,
+        **data: Any,
+    ) -> None:
+        super().__init__(dispatcher, bot, handle_in_background=True, secret_token=secret_token, **data)
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self._drain_timeout = max(0.0, drain_timeout)
+        self._closing = False
+
+    async def handle(self, request: web.Request) -> web.Response:
+        if self._closing:
+            return web.Response(status=503)
+        return await super().handle(request)
+
+    __call__ = handle
+
+    async def _background_feed_update(self, bot: Bot, update: Dict[str, Any]) -> None:
+        async with self._semaphore:
+            await super()._background_feed_update(bot, update)
+
+    async def drain(self) -> int:
+        """Stop accepting updates and wait for the running ones; returns how many were abandoned."""
+        self._closing = True
+        tasks = set(self._background_feed_update_tasks)
+        if not tasks:
+            return 0
+        _, pending = await asyncio.wait(tasks, timeout=self._drain_timeout)
+        for task in pending:
+            task.cancel()
+        return len(pending)
+
+    async def close(self) -> None:
+        await self.drain()
+        await super().close()
+
+
+def _stop_event() -> asyncio.Event:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            # ویندوز؛ Ctrl+C همچنان تسک اصلی را لغو می‌کند
+            pass
+    return stop
+
+
+async def run_webhook(dp: Dispatcher, bot: Bot, settings: Settings) -> None:
+    """Serve updates over HTTP until SIGINT/SIGTERM, then drain in-flight updates and shut down."""
+    app = web.Application()
+    handler = DrainingRequestHandler(
+        dp,
+        bot,
+        secret_token=settings.webhook_secret,
+        max_concurrency=settings.webhook_max_concurrency,
+        drain_timeout=settings.webhook_drain_timeout,
+    )
+    # ترتیب on_shutdown مهم است: اول تخلیه آپدیت‌های در جریان، بعد shutdown دیسپچر
+    handler.register(app, path=settings.webhook_path)
+    setup_application(app, dp, bot=bot)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, settings.webhook_host, settings.webhook_port)
+    stop = _stop_event()
+    try:
+        await site.start()
+        if settings.webhook_url:
+            await bot.set_webhook(
+                url=settings.webhook_url.rstrip("/") + settings.webhook_path,
+                secret_token=settings.webhook_secret,
+                allowed_updates=dp.resolve_used_update_types(),
+            )
+        await stop.wait()
+    finally:
+        await runner.cleanup()
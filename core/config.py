@@ -1,10 +1,7 @@
 import os
+import re
 from dataclasses import dataclass
-from typing import Optional
-
-from dotenv import load_dotenv
-
-load_dotenv()
+from typing import List, Optional, Tuple
 
 
 def _optional_env(key: str) -> Optional[str]:
@@ -23,6 +20,17 @@ def _float_env(key: str, default: float) -> float:
     return value
 
 
+def _int_env(key: str, default: int) -> int:
+    raw = os.getenv(key)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        value = int(raw)
+    except ValueError as exc:
+        raise ValueError(f"مقدار {key} باید عدد صحیح باشد.") from exc
+    return value
+
+
 def _bool_env(key: str, default: bool = False) -> bool:
     raw = os.getenv(key)
     if raw is None:
@@ -30,23 +38,123 @@ def _bool_env(key: str, default: bool = False) -> bool:
     return raw.strip().lower() in ("1", "true", "yes", "on")
 
 
+def _int_list_env(key: str) -> List[int]:
+    raw = os.getenv(key, "")
+    try:
+        return [int(part) for part in raw.replace(" ", "").split(",") if part]
+    except ValueError as exc:
+        raise ValueError(f"مقدار {key} باید فهرستی از اعداد صحیح جداشده با کاما باشد.") from exc
+
+
+def _choice_env(key: str, default: str, choices: Tuple[str, ...]) -> str:
+    raw = os.getenv(key, "").strip().upper()
+    if not raw:
+        return default
+    if raw not in choices:
+        raise ValueError(f"مقدار {key} باید یکی از {', '.join(choices)} باشد.")
+    return raw
+
+
+@dataclass(frozen=True)
+class SQLiteProfile:
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    busy_timeout_ms: int = 5000
+    mmap_size: int = 268435456
+    cache_size: int = -16000
+    temp_store: str = "MEMORY"
+
+    @classmethod
+    def load(cls) -> "SQLiteProfile":
+        return cls(
+            journal_mode=_choice_env(
+                "SQLITE_JOURNAL_MODE", "WAL", ("WAL", "DELETE", "TRUNCATE", "PERSIST", "MEMORY")
+            ),
+            synchronous=_choice_env("SQLITE_SYNCHRONOUS", "NORMAL", ("OFF", "NORMAL", "FULL", "EXTRA")),
+            busy_timeout_ms=max(0, _int_env("SQLITE_BUSY_TIMEOUT_MS", 5000)),
+            mmap_size=max(0, _int_env("SQLITE_MMAP_SIZE", 268435456)),
+            cache_size=_int_env("SQLITE_CACHE_SIZE", -16000),
+            temp_store=_choice_env("SQLITE_TEMP_STORE", "MEMORY", ("DEFAULT", "FILE", "MEMORY")),
+        )
+
+    def connection_pragmas(self) -> List[str]:
+        return [
+            f"PRAGMA busy_timeout = {self.busy_timeout_ms}",
+            f"PRAGMA mmap_size = {self.mmap_size}",
+            f"PRAGMA cache_size = {self.cache_size}",
+            f"PRAGMA temp_store = {self.temp_store}",
+        ]
+
+    def writer_pragmas(self) -> List[str]:
+        return [
+            f"PRAGMA journal_mode = {self.journal_mode}",
+            f"PRAGMA synchronous = {self.synchronous}",
+            *self.connection_pragmas(),
+        ]
+
+
 @dataclass
 class Settings:
     bot_token: str
     bot_username: str
     db_path: str
+    db_pool_size: int
+    db_statement_cache_size: int
+    sqlite: SQLiteProfile
     log_level: str
     log_to_console: bool
+    log_queue_size: int
+    log_batch_size: int
+    log_flush_interval: float
+    log_overflow_policy: str
+    log_sample_rate: int
     telegram_api_base: Optional[str]
     telegram_file_api_base: Optional[str]
     telegram_proxy: Optional[str]
     telegram_request_timeout: float
     telegram_retry_delay: float
     updates_group_id: Optional[int]
+    updates_group_ids: List[int]
+    notify_coalesce_window: float
+    notify_global_rate: float
+    notify_group_rate: float
+    notify_max_retries: int
+    session_profile_ttl: float
+    session_backend: str
+    session_save_delay: float
+    inline_message_limit: int
+    render_cache_size: int
+    inline_cleanup_concurrency: int
+    inline_cleanup_rate: float
+    inline_cleanup_deferred: bool
+    fsm_storage: str
+    fsm_cache_size: int
+    fsm_state_ttl: float
+    fsm_compact_interval: float
     enable_group_id_command: bool
+    update_concurrency: int
+    update_max_pending: int
+    update_overload_policy: str
+    run_mode: str
+    webhook_host: str
+    webhook_port: int
+    webhook_path: str
+    webhook_url: Optional[str]
+    webhook_secret: Optional[str]
+    webhook_max_concurrency: int
+    webhook_drain_timeout: float
+    perf_window: int
+    perf_slow_threshold_ms: float
+    perf_dump_interval: float
+    project_read_model: bool
 
     @classmethod
     def load(cls) -> "Settings":
+        """Read settings from the environment; `.env` fills in variables that are not already set."""
+        # فقط هنگام خواندن تنظیمات؛ import این ماژول (مثلاً از db.session) نباید فایل .env را بخواند
+        from dotenv import load_dotenv
+
+        load_dotenv()
         token = os.getenv("BOT_TOKEN", "").strip()
         raw_username = os.getenv("BOT_USERNAME", "").strip()
         username = raw_username.lstrip("@")
@@ -56,17 +164,62 @@ class Settings:
             raise ValueError("BOT_USERNAME در فایل .env تعریف نشده است")
         group_raw = os.getenv("UPDATES_GROUP_ID", "").strip()
         group_id = int(group_raw) if group_raw else None
+        webhook_secret = _optional_env("WEBHOOK_SECRET")
+        if webhook_secret and not re.fullmatch(r"[A-Za-z0-9_-]{1,256}", webhook_secret):
+            raise ValueError("WEBHOOK_SECRET فقط می‌تواند شامل حروف انگلیسی، اعداد، _ و - (حداکثر ۲۵۶ نویسه) باشد.")
+        webhook_path = "/" + os.getenv("WEBHOOK_PATH", "/webhook").strip().strip("/")
+        group_ids = ([group_id] if group_id is not None else []) + _int_list_env("UPDATES_GROUP_IDS")
         return cls(
             bot_token=token,
             bot_username=username,
             db_path=os.getenv("DB_PATH", "data/app.db"),
+            db_pool_size=max(1, _int_env("DB_POOL_SIZE", 4)),
+            db_statement_cache_size=max(0, _int_env("DB_STATEMENT_CACHE_SIZE", 256)),
+            sqlite=SQLiteProfile.load(),
             log_level=os.getenv("LOG_LEVEL", "INFO"),
             log_to_console=_bool_env("LOG_TO_CONSOLE", False),
+            log_queue_size=max(1, _int_env("LOG_QUEUE_SIZE", 1000)),
+            log_batch_size=max(1, _int_env("LOG_BATCH_SIZE", 100)),
+            log_flush_interval=max(0.0, _float_env("LOG_FLUSH_INTERVAL", 1.0)),
+            log_overflow_policy=_choice_env("LOG_OVERFLOW_POLICY", "DROP", ("DROP", "BLOCK", "SAMPLE")).lower(),
+            log_sample_rate=max(1, _int_env("LOG_SAMPLE_RATE", 10)),
             telegram_api_base=_optional_env("TELEGRAM_API_BASE"),
             telegram_file_api_base=_optional_env("TELEGRAM_FILE_API_BASE"),
             telegram_proxy=_optional_env("TELEGRAM_PROXY"),
             telegram_request_timeout=_float_env("TELEGRAM_REQUEST_TIMEOUT", 60.0),
             telegram_retry_delay=_float_env("TELEGRAM_RETRY_DELAY", 5.0),
             updates_group_id=group_id,
+            updates_group_ids=list(dict.fromkeys(group_ids)),
+            notify_coalesce_window=max(0.0, _float_env("NOTIFY_COALESCE_WINDOW", 2.0)),
+            notify_global_rate=max(1.0, _float_env("NOTIFY_GLOBAL_RATE", 30.0)),
+            notify_group_rate=max(1.0, _float_env("NOTIFY_GROUP_RATE", 20.0)),
+            notify_max_retries=max(0, _int_env("NOTIFY_MAX_RETRIES", 3)),
+            session_profile_ttl=max(0.0, _float_env("SESSION_PROFILE_TTL", 60.0)),
+            session_backend=_choice_env("SESSION_BACKEND", "JSON", ("JSON", "SQLITE")).lower(),
+            session_save_delay=max(0.0, _float_env("SESSION_SAVE_DELAY", 0.5)),
+            inline_message_limit=max(1, _int_env("INLINE_MESSAGE_LIMIT", 20)),
+            render_cache_size=max(1, _int_env("RENDER_CACHE_SIZE", 512)),
+            inline_cleanup_concurrency=max(1, _int_env("INLINE_CLEANUP_CONCURRENCY", 5)),
+            inline_cleanup_rate=max(1.0, _float_env("INLINE_CLEANUP_RATE", 20.0)),
+            inline_cleanup_deferred=_bool_env("INLINE_CLEANUP_DEFERRED", False),
+            fsm_storage=_choice_env("FSM_STORAGE", "SQLITE", ("SQLITE", "MEMORY")).lower(),
+            fsm_cache_size=max(1, _int_env("FSM_CACHE_SIZE", 1024)),
+            fsm_state_ttl=max(0.0, _float_env("FSM_STATE_TTL", 86400.0)),
+            fsm_compact_interval=max(1.0, _float_env("FSM_COMPACT_INTERVAL", 3600.0)),
             enable_group_id_command=_bool_env("ENABLE_GROUP_ID_COMMAND", True),
+            update_concurrency=max(1, _int_env("UPDATE_CONCURRENCY", 32)),
+            update_max_pending=max(0, _int_env("UPDATE_MAX_PENDING", 1000)),
+            update_overload_policy=_choice_env("UPDATE_OVERLOAD_POLICY", "QUEUE", ("QUEUE", "SHED")).lower(),
+            run_mode=_choice_env("RUN_MODE", "POLLING", ("POLLING", "WEBHOOK")).lower(),
+            webhook_host=os.getenv("WEBHOOK_HOST", "0.0.0.0").strip() or "0.0.0.0",
+            webhook_port=_int_env("WEBHOOK_PORT", 8080),
+            webhook_path=webhook_path,
+            webhook_url=_optional_env("WEBHOOK_URL"),
+            webhook_secret=webhook_secret,
+            webhook_max_concurrency=max(1, _int_env("WEBHOOK_MAX_CONCURRENCY", 64)),
+            webhook_drain_timeout=max(0.0, _float_env("WEBHOOK_DRAIN_TIMEOUT", 30.0)),
+            perf_window=max(1, _int_env("PERF_WINDOW", 1000)),
+            perf_slow_threshold_ms=max(0.0, _float_env("PERF_SLOW_THRESHOLD_MS", 500.0)),
+            perf_dump_interval=max(0.0, _float_env("PERF_DUMP_INTERVAL", 300.0)),
+            project_read_model=_bool_env("PROJECT_READ_MODEL", False),
         )
@@ -40,9 +40,11 @@ PROJECT_GROUP_LABELS = {
 SKIP_OWNER_BUTTON = "🚫 عدم انتخاب مسئول"
 SKIP_DESCRIPTION_BUTTON = "⏭️ بدون توضیحات"
 DATE_FORMATS = ("%Y/%m/%d", "%Y-%m-%d")
+PROJECTS_PAGE_SIZE = 20
 
 @dataclass(frozen=True)
 class AppPaths:
     logs_root: str = "logs"
     migrations_dir: str = "data/migrations"
     default_db: str = "data/app.db"
+    session_cache: str = "data/session_cache.json"
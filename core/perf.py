@@ -0,0 +1,45 @@
+from contextvars import Context, ContextVar, copy_context
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+@dataclass
+class Trace:
+    """Cost of one update: filled in by the DB layer and the Bot API session while the handler runs."""
+
+    handler: Optional[str] = None
+    db_calls: int = 0
+    db_time: float = 0.0
+    api_calls: int = 0
+    api_time: float = 0.0
+    # query name -> [calls, seconds]
+    queries: Dict[str, List[float]] = field(default_factory=dict)
+
+
+current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+
+
+def detached_context() -> Context:
+    """Copy of the current context without the handler's trace, for work that outlives the handler."""
+    context = copy_context()
+    context.run(current_trace.set, None)
+    return context
+
+
+def record_query(name: str, elapsed: float) -> None:
+    trace = current_trace.get()
+    if trace is None:
+        return
+    trace.db_calls += 1
+    trace.db_time += elapsed
+    entry = trace.queries.setdefault(name, [0, 0.0])
+    entry[0] += 1
+    entry[1] += elapsed
+
+
+def record_api(elapsed: float) -> None:
+    trace = current_trace.get()
+    if trace is None:
+        return
+    trace.api_calls += 1
+    trace.api_time += elapsed
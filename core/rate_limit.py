@@ -0,0 +1,32 @@
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Allows `rate` acquisitions per second on average with bursts of up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self._rate = max(rate, 1e-6)
+        self._capacity = max(1.0, capacity)
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+
+    @property
+    def idle(self) -> bool:
+        """True when no caller is waiting and the bucket has refilled, i.e. a fresh bucket would behave the same."""
+        if self._lock.locked():
+            return False
+        refilled = self._tokens + (time.monotonic() - self._updated) * self._rate
+        return refilled >= self._capacity
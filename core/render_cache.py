@@ -0,0 +1,75 @@
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+
+def project_key(project: Dict) -> Optional[Tuple[int, int]]:
+    """(id, row_version) of a full project row; None for partial rows that must not be cached."""
+    if "id" not in project or "row_version" not in project:
+        return None
+    return project["id"], project["row_version"]
+
+
+class RenderCache:
+    """
+    LRU cache of rendered project texts. Profiles are keyed by (project id, row_version);
+    grouped lists by the keys of every project they contain.
+    """
+
+    def __init__(self, max_size: int = 512) -> None:
+        self._max_size = max(1, max_size)
+        self._profiles: "OrderedDict[Tuple[int, int], str]" = OrderedDict()
+        self._lists: "OrderedDict[Hashable, str]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def resize(self, max_size: int) -> None:
+        self._max_size = max(1, max_size)
+        self._trim(self._profiles)
+        self._trim(self._lists)
+
+    def profile(self, project: Dict, render: Callable[[Dict], str]) -> str:
+        key = project_key(project)
+        if key is None:
+            return render(project)
+        return self._get(self._profiles, key, lambda: render(project))
+
+    def grouped(self, grouped: Dict[str, List[Dict]], render: Callable[[], str]) -> str:
+        keys = []
+        for status in sorted(grouped):
+            for project in grouped[status]:
+                key = project_key(project)
+                if key is None:
+                    return render()
+                keys.append(key)
+            keys.append(status)
+        return self._get(self._lists, tuple(keys), render)
+
+    def invalidate(self, project_id: int) -> None:
+        """Hook for ProjectService: drops every cached text that shows the project."""
+        for key in [key for key in self._profiles if key[0] == project_id]:
+            del self._profiles[key]
+        # فهرست‌های گروه‌بندی‌شده کم‌تعدادند؛ با هر تغییر همه دور ریخته می‌شوند
+        self._lists.clear()
+
+    def clear(self) -> None:
+        self._profiles.clear()
+        self._lists.clear()
+
+    def _get(self, cache: "OrderedDict", key: Hashable, render: Callable[[], str]) -> str:
+        text = cache.get(key)
+        if text is not None:
+            cache.move_to_end(key)
+            self.hits += 1
+            return text
+        self.misses += 1
+        text = render()
+        cache[key] = text
+        self._trim(cache)
+        return text
+
+    def _trim(self, cache: "OrderedDict") -> None:
+        while len(cache) > self._max_size:
+            cache.popitem(last=False)
+
+
+render_cache = RenderCache()
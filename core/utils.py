@@ -5,6 +5,7 @@ from pathlib import Path
 from typing import Dict, List, Optional
 
 from core.constants import PROJECT_GROUP_LABELS, STATUS_LABELS
+from core.render_cache import render_cache
 
 
 def ensure_directory(path: Path) -> None:
@@ -47,6 +48,10 @@ def format_project_block(title: str, projects: List[Dict]) -> str:
 
 
 def grouped_projects_text(grouped: Dict[str, List[Dict]]) -> str:
+    return render_cache.grouped(grouped, lambda: _render_grouped(grouped))
+
+
+def _render_grouped(grouped: Dict[str, List[Dict]]) -> str:
     sections = ["📁 فهرست پروژه‌ها:"]
     for status, label in PROJECT_GROUP_LABELS.items():
         sections.append(format_project_block(label, grouped.get(status, [])))
@@ -1,2 +1,3 @@
+-- skip-if-column: users.telegram_id
 ALTER TABLE users ADD COLUMN telegram_id INTEGER;
 CREATE UNIQUE INDEX IF NOT EXISTS idx_users_telegram_id ON users(telegram_id);
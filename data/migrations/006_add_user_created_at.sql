@@ -1,2 +1,3 @@
+-- skip-if-column: users.created_at
 ALTER TABLE users ADD COLUMN created_at TEXT;
 UPDATE users SET created_at = COALESCE(created_at, datetime('now'));
@@ -1,2 +1,3 @@
+-- skip-if-column: users.active
 ALTER TABLE users ADD COLUMN active INTEGER NOT NULL DEFAULT 1;
 UPDATE users SET active = 1 WHERE active IS NULL;
@@ -0,0 +1,8 @@
+CREATE TABLE IF NOT EXISTS fsm_states (
+    key TEXT PRIMARY KEY,
+    state TEXT,
+    data TEXT NOT NULL DEFAULT '{}',
+    updated_at REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_fsm_states_updated ON fsm_states(updated_at);
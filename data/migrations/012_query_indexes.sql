@@ -0,0 +1,14 @@
+-- فهرست پروژه‌های حذف‌نشده به ترتیب جدیدترین
+CREATE INDEX IF NOT EXISTS idx_projects_live
+    ON projects(id DESC, title, status)
+    WHERE status != 'deleted';
+
+-- پروژه‌های حذف‌نشده هر مسئول به ترتیب جدیدترین
+CREATE INDEX IF NOT EXISTS idx_projects_live_owner
+    ON projects(owner_name, id DESC, title, status)
+    WHERE status != 'deleted';
+
+CREATE INDEX IF NOT EXISTS idx_users_name ON users(name);
+
+CREATE INDEX IF NOT EXISTS idx_owner_history_project
+    ON project_owner_history(project_id, id, owner_name, from_date, to_date);
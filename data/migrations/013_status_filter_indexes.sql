@@ -0,0 +1,7 @@
+-- فیلتر وضعیت: پروژه‌های یک وضعیت به ترتیب جدیدترین، و شمارش به‌ازای وضعیت
+CREATE INDEX IF NOT EXISTS idx_projects_status_recent
+    ON projects(status, id DESC, title);
+
+-- فیلتر وضعیت برای پروژه‌های یک مسئول
+CREATE INDEX IF NOT EXISTS idx_projects_owner_status
+    ON projects(owner_name, status, id DESC, title);
@@ -0,0 +1,2 @@
+-- شماره نسخه ردیف؛ هر تغییر پروژه آن را یکی زیاد می‌کند (کلید کش متن‌های ساخته‌شده)
+ALTER TABLE projects ADD COLUMN row_version INTEGER NOT NULL DEFAULT 0;
@@ -0,0 +1,96 @@
+import json
+import textwrap
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from core.perf import record_query
+
+
+@dataclass(frozen=True)
+class Query:
+    name: str
+    sql: str
+    # True for statements that are meant to read the whole table (e.g. loading a cache at startup)
+    allow_scan: bool = False
+    # index a deliberate full read must walk (SCAN t USING INDEX i); the plan check fails if it changes
+    expect_index: Optional[str] = None
+    # Record subclass (db.records) each result row is built as; None keeps plain dict rows
+    record: Optional[type] = None
+
+    def __str__(self) -> str:
+        return self.sql
+
+
+SQL = Union[str, Query]
+
+REGISTRY: Dict[str, Query] = {}
+
+
+def register(
+    name: str,
+    sql: str,
+    allow_scan: bool = False,
+    record: Optional[type] = None,
+    expect_index: Optional[str] = None,
+) -> Query:
+    """Register a named statement; the same name must always map to the same SQL."""
+    text = textwrap.dedent(sql).strip()
+    existing = REGISTRY.get(name)
+    if existing is not None and existing.sql != text:
+        raise ValueError(f"کوئری {name} قبلاً با متن دیگری ثبت شده است")
+    query = Query(name=name, sql=text, allow_scan=allow_scan, expect_index=expect_index, record=record)
+    REGISTRY[name] = query
+    return query
+
+
+def query_name(query: SQL) -> str:
+    if isinstance(query, Query):
+        return query.name
+    return "inline:" + " ".join(str(query).split())[:80]
+
+
+def query_sql(query: SQL) -> str:
+    return query.sql if isinstance(query, Query) else query
+
+
+class QueryStats:
+    """Per-query call count, total time and rows returned."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: Dict[str, List[float]] = {}
+
+    def record(self, query: SQL, elapsed: float, rows: int) -> None:
+        name = query_name(query)
+        record_query(name, elapsed)
+        with self._lock:
+            entry = self._stats.setdefault(name, [0, 0.0, 0])
+            entry[0] += 1
+            entry[1] += elapsed
+            entry[2] += rows
+
+    def snapshot(self) -> List[dict]:
+        with self._lock:
+            items = [(name, *values) for name, values in self._stats.items()]
+        result = [
+            {
+                "name": name,
+                "calls": int(calls),
+                "total_ms": round(total * 1000, 3),
+                "avg_ms": round(total * 1000 / calls, 3) if calls else 0.0,
+                "rows": int(rows),
+            }
+            for name, calls, total, rows in items
+        ]
+        result.sort(key=lambda item: item["total_ms"], reverse=True)
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def dump(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.snapshot(), ensure_ascii=False, indent=2), encoding="utf-8")
@@ -0,0 +1,102 @@
+"""Run EXPLAIN QUERY PLAN on every registered query and report full table scans.
+
+Queries that deliberately read every live row declare the index they walk (expect_index);
+their plan must scan through exactly that index, so dropping or no longer matching it fails
+the check instead of silently turning into a table scan.
+
+Run from the repository root (exits with status 1 when a scan is found):
+
+    python -m db.query_plans
+"""
+import asyncio
+import re
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from core.constants import AppPaths
+from db.queries import REGISTRY, Query
+from db.session import Database
+
+# ماژول‌هایی که کوئری‌هایشان را هنگام import ثبت می‌کنند
+QUERY_MODULES = (
+    "services.project_service",
+    "services.project_read_model",
+    "services.user_service",
+    "services.session_manager",
+    "bot.fsm.storage",
+)
+
+# «SCAN t USING INDEX i» هم همه ردیف‌ها را (به ترتیب ایندکس) می‌خواند؛ فقط SEARCH از ایندکس برای محدود کردن استفاده می‌کند
+FULL_SCAN = re.compile(r"^SCAN ")
+
+
+def _uses_index(detail: str, index: str) -> bool:
+    return re.search(rf"\bINDEX {re.escape(index)}\b", detail) is not None
+
+
+def plan_problem(query: Query, plan: List[str]) -> Optional[str]:
+    """Why the plan is rejected, or None when it is acceptable."""
+    scans = [detail for detail in plan if FULL_SCAN.match(detail)]
+    if query.expect_index is None:
+        return "FULL SCAN" if scans else None
+    if not any(_uses_index(detail, query.expect_index) for detail in plan):
+        return f"MISSING INDEX {query.expect_index}"
+    if any(not _uses_index(detail, query.expect_index) for detail in scans):
+        return "FULL SCAN"
+    return None
+
+
+def load_registered_queries() -> Dict[str, Query]:
+    for module in QUERY_MODULES:
+        __import__(module)
+    return dict(REGISTRY)
+
+
+async def explain(database: Database, query: Query) -> List[str]:
+    params = [None] * query.sql.count("?")
+    rows = await database.fetchall(f"EXPLAIN QUERY PLAN {query.sql}", params)
+    return [row["detail"] for row in rows]
+
+
+async def find_full_scans(database: Database) -> Dict[str, Tuple[str, List[str]]]:
+    """Map query name to (problem, plan) for every registered query that scans a table without the expected index."""
+    failures: Dict[str, Tuple[str, List[str]]] = {}
+    for name, query in sorted(load_registered_queries().items()):
+        if query.allow_scan:
+            continue
+        plan = await explain(database, query)
+        problem = plan_problem(query, plan)
+        if problem is not None:
+            failures[name] = (problem, plan)
+    return failures
+
+
+async def run() -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "plans.db")
+        migrator = Database(path)
+        await migrator.run_migrations(AppPaths().migrations_dir)
+        await migrator.close()
+        # fresh connections so the plans see the fully migrated schema
+        database = Database(path)
+        try:
+            failures = await find_full_scans(database)
+        finally:
+            await database.close()
+    checked = sum(1 for query in REGISTRY.values() if not query.allow_scan)
+    if not failures:
+        print(f"{checked} registered queries checked, no full table scans.")
+        return 0
+    for name, (problem, plan) in failures.items():
+        print(f"{problem} {name}: {' | '.join(plan)}")
+    return 1
+
+
+def main() -> None:
+    sys.exit(asyncio.run(run()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+from collections.abc import Mapping
+from typing import Any, ClassVar, FrozenSet, Iterable, Iterator, Optional, Sequence, Tuple, Type, TypeVar
+
+# ردیف برگشتی از Database: dict برای کوئری‌های بدون نوع و Record برای جدول‌های شناخته‌شده
+Row = Mapping[str, Any]
+
+_MISSING = object()
+
+R = TypeVar("R", bound="Record")
+
+
+class Record(Mapping):
+    """
+    Row of a known table kept in __slots__ instead of a per-row dict.
+    It reads like the dict rows it replaces (row["x"], row.get("x"), `in`, dict(row), ==) and
+    accepts row["x"] = value for its own columns. Columns a query did not select are absent,
+    exactly as they would be from the dict, so partial rows keep their meaning.
+    Typed queries select COLUMNS rather than `*`, so a column added by a later migration
+    does not reach from_values until it is added to FIELDS.
+    """
+
+    __slots__ = ()
+    FIELDS: ClassVar[Tuple[str, ...]] = ()
+    _FIELD_SET: ClassVar[FrozenSet[str]] = frozenset()
+    # فهرست ستون‌ها برای SELECT و RETURNING به‌جای *
+    COLUMNS: ClassVar[str] = ""
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._FIELD_SET = frozenset(cls.FIELDS)
+        cls.COLUMNS = ", ".join(cls.FIELDS)
+
+    def __init__(self, values: Mapping = (), **columns: Any) -> None:
+        for key, value in dict(values, **columns).items():
+            self[key] = value
+
+    @classmethod
+    def from_values(cls: Type[R], names: Sequence[str], values: Iterable[Any]) -> R:
+        """Build a record from parallel column names and values (e.g. a cursor row)."""
+        if not cls._FIELD_SET.issuperset(names):
+            unknown = ", ".join(name for name in names if name not in cls._FIELD_SET)
+            raise KeyError(f"ستون {unknown} در {cls.__name__} تعریف نشده است")
+        record = cls.__new__(cls)
+        for name, value in zip(names, values):
+            setattr(record, name, value)
+        return record
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._FIELD_SET:
+            value = getattr(self, key, _MISSING)
+            if value is not _MISSING:
+                return value
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self._FIELD_SET:
+            raise KeyError(f"ستون {key} در {type(self).__name__} تعریف نشده است")
+        setattr(self, key, value)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._FIELD_SET and hasattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return (name for name in self.FIELDS if hasattr(self, name))
+
+    def __len__(self) -> int:
+        return sum(1 for name in self.FIELDS if hasattr(self, name))
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._FIELD_SET:
+            return getattr(self, key, default)
+        return default
+
+    def copy(self: R) -> R:
+        clone = type(self).__new__(type(self))
+        for name in self.FIELDS:
+            value = getattr(self, name, _MISSING)
+            if value is not _MISSING:
+                setattr(clone, name, value)
+        return clone
+
+    def _values(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, name, _MISSING) for name in self.FIELDS)
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is type(self):
+            return self._values() == other._values()
+        return Mapping.__eq__(self, other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+
+class Project(Record):
+    FIELDS = (
+        "id",
+        "title",
+        "description",
+        "status",
+        "owner_name",
+        "start_date",
+        "end_date",
+        "version",
+        "version_updated_at",
+        "deleted_at",
+        "row_version",
+    )
+    __slots__ = FIELDS
+
+
+class User(Record):
+    FIELDS = ("id", "phone", "name", "role", "telegram_id", "created_at", "active")
+    __slots__ = FIELDS
+
+
+class OwnerHistory(Record):
+    FIELDS = ("id", "project_id", "owner_name", "from_date", "to_date")
+    __slots__ = FIELDS
+
+
+def as_record(record: Type[R], value: Optional[Mapping]) -> Optional[R]:
+    """Convert a dict row (e.g. one loaded from JSON) to `record`; None and records pass through."""
+    if value is None or isinstance(value, record):
+        return value
+    return record(value)
@@ -1,106 +1,312 @@
 ﻿from __future__ import annotations
 import asyncio
+import hashlib
+import os
+import re
+import sqlite3
+import time
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Any, Iterable, List, Optional
+from typing import Any, AsyncIterator, Iterable, List, Optional
 
 import aiosqlite
 
+from core.config import SQLiteProfile
+from db.queries import SQL, Query, QueryStats, query_sql
+from db.records import Row
+
+MIGRATIONS_FINGERPRINT = "migrations_fingerprint"
+# «-- skip-if-column: users.telegram_id»: اگر ستون از قبل وجود دارد مایگریشن فقط ثبت می‌شود
+_SKIP_IF_COLUMN = re.compile(r"^--\s*skip-if-column:\s*(\w+)\.(\w+)\s*$", re.MULTILINE)
+_TRANSACTION_CONTROL = re.compile(r"^(BEGIN|COMMIT|END|ROLLBACK)\b", re.IGNORECASE)
+_LEADING_COMMENTS = re.compile(r"^(\s*--[^\n]*\n)*\s*")
+
+
+def migrations_fingerprint(directory: Path) -> str:
+    """Hash of migration file names, sizes and mtimes: one directory listing, no file reads."""
+    entries = sorted(
+        (entry.name, entry.stat().st_size, entry.stat().st_mtime_ns)
+        for entry in os.scandir(directory)
+        if entry.name.endswith(".sql") and entry.is_file()
+    )
+    digest = hashlib.sha256()
+    for name, size, mtime in entries:
+        digest.update(f"{name}\0{size}\0{mtime}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def split_statements(script: str) -> List[str]:
+    """Split a migration script into statements, dropping its own BEGIN/COMMIT so it can join an outer transaction."""
+    statements = []
+    start = 0
+    for end in (match.end() for match in re.finditer(";", script)):
+        chunk = script[start:end]
+        if not sqlite3.complete_statement(chunk):
+            # نقطه‌ویرگول داخل رشته یا بدنه تریگر
+            continue
+        start = end
+        statement = _LEADING_COMMENTS.sub("", chunk).strip()
+        if statement and not _TRANSACTION_CONTROL.match(statement):
+            statements.append(statement)
+    if _LEADING_COMMENTS.sub("", script[start:]).strip():
+        raise ValueError("مایگریشن با دستور ناقص (بدون ;) تمام شده است")
+    return statements
+
+
+def _convert(cursor: aiosqlite.Cursor, rows: Iterable[sqlite3.Row], record: Optional[type]) -> List[Row]:
+    if record is None:
+        return [dict(row) for row in rows]
+    names = [column[0] for column in cursor.description]
+    return [record.from_values(names, row) for row in rows]
+
+
+async def _run(
+    conn: aiosqlite.Connection,
+    stats: QueryStats,
+    query: SQL,
+    params: Iterable[Any],
+    fetch: Optional[str] = None,
+) -> Any:
+    started = time.perf_counter()
+    cursor = await conn.execute(query_sql(query), tuple(params))
+    record = query.record if isinstance(query, Query) else None
+    if fetch == "one":
+        row = await cursor.fetchone()
+        result = _convert(cursor, [row], record)[0] if row is not None else None
+        count = 0 if row is None else 1
+    elif fetch == "all":
+        rows = await cursor.fetchall()
+        result = _convert(cursor, rows, record)
+        count = len(result)
+    else:
+        result, count = None, 0
+    await cursor.close()
+    stats.record(query, time.perf_counter() - started, count)
+    return result
+
+
+class Transaction:
+    """Statements issued on the writer connection inside Database.transaction(); committed together."""
+
+    def __init__(self, conn: aiosqlite.Connection, stats: QueryStats):
+        self._conn = conn
+        self._stats = stats
+
+    async def execute(self, query: SQL, params: Iterable[Any] = ()) -> None:
+        await _run(self._conn, self._stats, query, params)
+
+    async def execute_returning(self, query: SQL, params: Iterable[Any] = ()) -> Optional[Row]:
+        return await _run(self._conn, self._stats, query, params, fetch="one")
+
+    async def executemany(self, query: SQL, params_seq: Iterable[Iterable[Any]]) -> None:
+        started = time.perf_counter()
+        await self._conn.executemany(query_sql(query), [tuple(params) for params in params_seq])
+        self._stats.record(query, time.perf_counter() - started, 0)
+
+    async def fetchone(self, query: SQL, params: Iterable[Any] = ()) -> Optional[Row]:
+        return await _run(self._conn, self._stats, query, params, fetch="one")
+
+    async def fetchall(self, query: SQL, params: Iterable[Any] = ()) -> List[Row]:
+        return await _run(self._conn, self._stats, query, params, fetch="all")
+
 
 class Database:
-    def __init__(self, path: str):
+    def __init__(
+        self,
+        path: str,
+        pool_size: int = 4,
+        profile: Optional[SQLiteProfile] = None,
+        statement_cache_size: int = 256,
+    ):
         self.path = path
+        self.profile = profile or SQLiteProfile()
+        self.stats = QueryStats()
+        self._statement_cache_size = max(0, statement_cache_size)
+        self._pool_size = max(1, pool_size)
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._write_lock = asyncio.Lock()
+        self._connect_lock = asyncio.Lock()
+        self._readers: List[aiosqlite.Connection] = []
+        self._idle_readers: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        self._reader_slots = asyncio.Semaphore(self._pool_size)
+        self._closed = False
         Path(self.path).parent.mkdir(parents=True, exist_ok=True)
 
-    async def _open(self) -> aiosqlite.Connection:
-        conn = await aiosqlite.connect(self.path)
+    async def _open(self, readonly: bool = False) -> aiosqlite.Connection:
+        if readonly:
+            uri = f"{Path(self.path).resolve().as_uri()}?mode=ro"
+            conn = await aiosqlite.connect(uri, uri=True, cached_statements=self._statement_cache_size)
+            pragmas = self.profile.connection_pragmas()
+        else:
+            conn = await aiosqlite.connect(self.path, cached_statements=self._statement_cache_size)
+            pragmas = self.profile.writer_pragmas()
         conn.row_factory = aiosqlite.Row
+        for pragma in pragmas:
+            await conn.execute(pragma)
         return conn
 
-    async def execute(self, query: str, params: Iterable[Any] = ()) -> None:
-        conn = await self._open()
-        try:
-            await conn.execute(query, tuple(params))
-            await conn.commit()
-        finally:
-            await conn.close()
+    async def connect(self) -> None:
+        """Open the long-lived writer connection; readers are opened on demand."""
+        await self._get_writer()
 
-    async def fetchone(self, query: str, params: Iterable[Any] = ()) -> Optional[dict]:
-        conn = await self._open()
-        try:
-            cursor = await conn.execute(query, tuple(params))
-            row = await cursor.fetchone()
-            await cursor.close()
-            if row is None:
-                return None
-            return dict(row)
-        finally:
+    async def close(self) -> None:
+        self._closed = True
+        async with self._write_lock:
+            if self._writer is not None:
+                await self._writer.close()
+                self._writer = None
+        readers, self._readers = self._readers, []
+        while not self._idle_readers.empty():
+            self._idle_readers.get_nowait()
+        for conn in readers:
             await conn.close()
 
-    async def fetchall(self, query: str, params: Iterable[Any] = ()) -> List[dict]:
-        conn = await self._open()
-        try:
-            cursor = await conn.execute(query, tuple(params))
-            rows = await cursor.fetchall()
-            await cursor.close()
-            return [dict(row) for row in rows]
-        finally:
-            await conn.close()
+    async def _get_writer(self) -> aiosqlite.Connection:
+        if self._writer is None:
+            async with self._connect_lock:
+                if self._writer is None:
+                    self._closed = False
+                    self._writer = await self._open()
+        return self._writer
 
-    async def executescript(self, script: str) -> None:
-        conn = await self._open()
-        try:
-            await conn.executescript(script)
+    @asynccontextmanager
+    async def _write(self) -> AsyncIterator[aiosqlite.Connection]:
+        conn = await self._get_writer()
+        async with self._write_lock:
+            if conn.in_transaction:
+                # تراکنشی که صاحبش وسط کار لغو شده نباید به نوشتن بعدی برسد
+                await conn.rollback()
+            yield conn
+
+    @asynccontextmanager
+    async def _read(self) -> AsyncIterator[aiosqlite.Connection]:
+        # the writer creates the file and switches it to WAL before any reader opens it
+        await self._get_writer()
+        async with self._reader_slots:
+            if self._idle_readers.empty():
+                conn = await self._open(readonly=True)
+                self._readers.append(conn)
+            else:
+                conn = self._idle_readers.get_nowait()
+            try:
+                yield conn
+            finally:
+                if self._closed or conn not in self._readers:
+                    await conn.close()
+                else:
+                    self._idle_readers.put_nowait(conn)
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[Transaction]:
+        """
+        Group several statements into one atomic commit on the writer connection.
+        Rolls back if the block raises; do not call other Database write methods inside the block.
+        """
+        async with self._write() as conn:
+            try:
+                await conn.execute("BEGIN IMMEDIATE")
+                yield Transaction(conn, self.stats)
+            except BaseException:
+                await conn.rollback()
+                raise
             await conn.commit()
-        finally:
-            await conn.close()
 
-    async def column_exists(self, table: str, column: str) -> bool:
-        conn = await self._open()
-        try:
-            cursor = await conn.execute(f"PRAGMA table_info({table})")
-            rows = await cursor.fetchall()
-            await cursor.close()
-            return any(row["name"] == column for row in rows)
-        finally:
-            await conn.close()
+    async def execute(self, query: SQL, params: Iterable[Any] = ()) -> None:
+        async with self._write() as conn:
+            try:
+                await _run(conn, self.stats, query, params)
+                await conn.commit()
+            except BaseException:
+                await conn.rollback()
+                raise
 
-    async def run_migrations(self, directory: str) -> None:
+    async def execute_returning(self, query: SQL, params: Iterable[Any] = ()) -> Optional[Row]:
+        """Run a write with a RETURNING clause and return its first row, committed in the same call."""
+        async with self._write() as conn:
+            try:
+                row = await _run(conn, self.stats, query, params, fetch="one")
+                await conn.commit()
+            except BaseException:
+                await conn.rollback()
+                raise
+            return row
+
+    async def executemany(self, query: SQL, params_seq: Iterable[Iterable[Any]]) -> None:
+        async with self._write() as conn:
+            try:
+                await Transaction(conn, self.stats).executemany(query, params_seq)
+                await conn.commit()
+            except BaseException:
+                await conn.rollback()
+                raise
+
+    async def fetchone(self, query: SQL, params: Iterable[Any] = ()) -> Optional[Row]:
+        async with self._read() as conn:
+            return await _run(conn, self.stats, query, params, fetch="one")
+
+    async def fetchall(self, query: SQL, params: Iterable[Any] = ()) -> List[Row]:
+        async with self._read() as conn:
+            return await _run(conn, self.stats, query, params, fetch="all")
+
+    async def run_migrations(self, directory: str) -> int:
+        """
+        Apply pending `*.sql` files in name order on the writer connection, all in one transaction;
+        returns how many were recorded. While the stored fingerprint of the directory matches,
+        startup costs a single query.
+        """
         path = Path(directory)
         if not path.exists():
-            return
-        await self.execute(
-            "CREATE TABLE IF NOT EXISTS schema_migrations (name TEXT PRIMARY KEY)"
-        )
-        for sql_file in sorted(path.glob("*.sql")):
-            name = sql_file.name
-            applied = await self.fetchone(
-                "SELECT 1 FROM schema_migrations WHERE name = ?",
-                (name,),
-            )
-            if applied:
-                continue
-            script = sql_file.read_text(encoding="utf-8")
-            # Skip idempotent migrations if column already exists
-            if "telegram_id" in script and await self.column_exists("users", "telegram_id"):
-                await self.execute(
-                    "INSERT INTO schema_migrations(name) VALUES (?)",
-                    (name,),
-                )
-                continue
-            if "created_at" in script and await self.column_exists("users", "created_at"):
-                await self.execute(
-                    "INSERT INTO schema_migrations(name) VALUES (?)",
-                    (name,),
+            return 0
+        fingerprint = migrations_fingerprint(path)
+        async with self._write() as conn:
+            if await self._stored_fingerprint(conn) == fingerprint:
+                return 0
+            await conn.execute("BEGIN IMMEDIATE")
+            try:
+                await conn.execute("CREATE TABLE IF NOT EXISTS schema_migrations (name TEXT PRIMARY KEY)")
+                await conn.execute(
+                    "CREATE TABLE IF NOT EXISTS schema_state (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
                 )
-                continue
-            if "active" in script and await self.column_exists("users", "active"):
-                await self.execute(
-                    "INSERT INTO schema_migrations(name) VALUES (?)",
-                    (name,),
+                cursor = await conn.execute("SELECT name FROM schema_migrations")
+                applied = {row["name"] for row in await cursor.fetchall()}
+                await cursor.close()
+                pending = [sql_file for sql_file in sorted(path.glob("*.sql")) if sql_file.name not in applied]
+                for sql_file in pending:
+                    script = sql_file.read_text(encoding="utf-8")
+                    if not await self._already_applied(conn, script):
+                        for statement in split_statements(script):
+                            await conn.execute(statement)
+                    await conn.execute("INSERT INTO schema_migrations(name) VALUES (?)", (sql_file.name,))
+                await conn.execute(
+                    "INSERT INTO schema_state(key, value) VALUES (?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                    (MIGRATIONS_FINGERPRINT, fingerprint),
                 )
-                continue
-            await self.executescript(script)
-            await self.execute(
-                "INSERT INTO schema_migrations(name) VALUES (?)",
-                (name,),
-            )
+            except BaseException:
+                await conn.rollback()
+                raise
+            await conn.commit()
+        return len(pending)
+
+    @staticmethod
+    async def _stored_fingerprint(conn: aiosqlite.Connection) -> Optional[str]:
+        try:
+            cursor = await conn.execute("SELECT value FROM schema_state WHERE key = ?", (MIGRATIONS_FINGERPRINT,))
+        except sqlite3.OperationalError:
+            # پایگاه داده تازه یا ساخته‌شده پیش از جدول schema_state
+            return None
+        row = await cursor.fetchone()
+        await cursor.close()
+        return row["value"] if row else None
+
+    @staticmethod
+    async def _already_applied(conn: aiosqlite.Connection, script: str) -> bool:
+        """True when the script declares `-- skip-if-column: table.column` and that column exists."""
+        guard = _SKIP_IF_COLUMN.search(script)
+        if guard is None:
+            return False
+        table, column = guard.groups()
+        cursor = await conn.execute(f"PRAGMA table_info({table})")
+        rows = await cursor.fetchall()
+        await cursor.close()
+        return any(row["name"] == column for row in rows)
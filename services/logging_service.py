@@ -1,62 +1,240 @@
+import asyncio
 import json
 import logging
 from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
 from core.utils import log_directory
 
+LOG_FILE = "bot.jsonl"
+ERRORS_FILE = "errors.jsonl"
+LEGACY_SUFFIX = ".json"
+OVERFLOW_POLICIES = ("drop", "block", "sample")
+_STOP = object()
+
+
+def _encode(entry: dict) -> str:
+    return json.dumps(entry, ensure_ascii=False) + "\n"
+
+
+def convert_legacy_file(legacy_path: Path) -> int:
+    """
+    Convert an array-format `*.json` log into its `*.jsonl` sibling.
+    Legacy entries are placed before any lines already in the target; the old file is kept as `*.json.migrated`.
+    """
+    try:
+        data = json.loads(legacy_path.read_text(encoding="utf-8"))
+    except (json.JSONDecodeError, OSError):
+        data = []
+    if not isinstance(data, list):
+        data = []
+    target = legacy_path.with_suffix(".jsonl")
+    existing = target.read_text(encoding="utf-8") if target.exists() else ""
+    tmp = target.with_suffix(".jsonl.tmp")
+    with tmp.open("w", encoding="utf-8") as handle:
+        handle.writelines(_encode(entry) for entry in data if isinstance(entry, dict))
+        handle.write(existing)
+    tmp.replace(target)
+    legacy_path.rename(legacy_path.with_name(legacy_path.name + ".migrated"))
+    return len(data)
+
+
+def convert_legacy_logs(logs_root: str) -> int:
+    root = Path(logs_root)
+    if not root.exists():
+        return 0
+    converted = 0
+    for name in (LOG_FILE, ERRORS_FILE):
+        legacy_name = Path(name).with_suffix(LEGACY_SUFFIX).name
+        for legacy_path in sorted(root.glob(f"*/*/{legacy_name}")):
+            converted += convert_legacy_file(legacy_path)
+    return converted
+
 
 class LogService:
-    def __init__(self, logs_root: str, level: str, log_to_console: bool = False) -> None:
+    def __init__(
+        self,
+        logs_root: str,
+        level: str,
+        log_to_console: bool = False,
+        queue_size: int = 1000,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        overflow_policy: str = "drop",
+        sample_rate: int = 10,
+    ) -> None:
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"سیاست سرریز لاگ باید یکی از {', '.join(OVERFLOW_POLICIES)} باشد.")
         self._logs_root = logs_root
         self._log_to_console = log_to_console
         self._logger = logging.getLogger("project_manager_bot")
         self._logger.setLevel(getattr(logging, level.upper(), logging.INFO))
-        self._json_file = None
-        self._errors_file = None
+        self._month: Optional[Tuple[int, int]] = None
+        self._json_file: Optional[Path] = None
+        self._errors_file: Optional[Path] = None
+        self._queue_size = max(1, queue_size)
+        self._batch_size = max(1, batch_size)
+        self._flush_interval = max(0.0, flush_interval)
+        self._overflow_policy = overflow_policy
+        self._sample_rate = max(1, sample_rate)
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._overflow_seen = 0
+        self._counters = {"queued": 0, "written": 0, "dropped": 0, "batches": 0}
         self._configure_handler()
 
     def _configure_handler(self) -> None:
-        log_dir = log_directory(self._logs_root)
-        self._json_file = log_dir / "bot.json"
-        self._errors_file = log_dir / "errors.json"
+        try:
+            convert_legacy_logs(self._logs_root)
+        except OSError:
+            self._logger.error("تبدیل لاگ‌های قدیمی JSON با خطا مواجه شد.")
+        self._rollover()
         if self._log_to_console:
             if not any(isinstance(h, logging.StreamHandler) for h in self._logger.handlers):
                 console = logging.StreamHandler()
                 console.setFormatter(logging.Formatter("%(levelname)s - %(message)s"))
                 self._logger.addHandler(console)
 
+    def _rollover(self) -> None:
+        now = datetime.utcnow()
+        month = (now.year, now.month)
+        if month == self._month:
+            return
+        log_dir = log_directory(self._logs_root)
+        self._json_file = log_dir / LOG_FILE
+        self._errors_file = log_dir / ERRORS_FILE
+        self._month = month
+
     async def info(self, message: str) -> None:
         await self._write("INFO", message)
 
+    async def warning(self, message: str) -> None:
+        await self._write("WARNING", message)
+
     async def error(self, message: str) -> None:
         await self._write("ERROR", message)
 
+    async def start(self) -> None:
+        if self._writer_task is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self._queue_size)
+        self._writer_task = asyncio.create_task(self._run_writer())
+
+    async def stop(self) -> None:
+        """Flush everything still queued and stop the background writer."""
+        if self._writer_task is None:
+            return
+        await self._queue.put(_STOP)
+        await self._writer_task
+        self._writer_task = None
+        self._queue = None
+
+    def stats(self) -> Dict[str, int]:
+        pending = self._queue.qsize() if self._queue is not None else 0
+        return {**self._counters, "pending": pending}
+
     async def _write(self, level: str, message: str) -> None:
         level_name = level.upper()
         self._logger.log(getattr(logging, level_name, logging.INFO), message)
         timestamp = datetime.utcnow().isoformat()
         entry = {"timestamp": timestamp, "level": level_name, "message": message}
-        await self._append(self._json_file, entry)
-        if level_name == "ERROR":
-            await self._append(self._errors_file, entry)
+        if self._queue is None:
+            await asyncio.to_thread(self._write_batch, [entry])
+            return
+        await self._enqueue(entry)
+
+    async def _enqueue(self, entry: dict) -> None:
+        try:
+            self._queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            if not self._accept_on_overflow(entry):
+                self._counters["dropped"] += 1
+                return
+            if self._overflow_policy == "block":
+                await self._queue.put(entry)
+            elif not self._replace_oldest(entry):
+                self._counters["dropped"] += 1
+                return
+        self._counters["queued"] += 1
+
+    def _replace_oldest(self, entry: dict) -> bool:
+        """Make room for a sampled entry without waiting: the oldest queued entry is dropped instead."""
+        oldest = self._queue.get_nowait()
+        if oldest is _STOP:
+            # سرویس در حال توقف است؛ علامت توقف باید در صف بماند
+            self._queue.put_nowait(oldest)
+            return False
+        self._counters["dropped"] += 1
+        self._queue.put_nowait(entry)
+        return True
+
+    def _accept_on_overflow(self, entry: dict) -> bool:
+        if self._overflow_policy == "block":
+            return True
+        if self._overflow_policy == "sample":
+            # خطاها هیچ‌وقت حذف نمی‌شوند؛ از بقیه فقط یک مورد در هر sample_rate نگه داشته می‌شود
+            if entry["level"] == "ERROR":
+                return True
+            self._overflow_seen += 1
+            return self._overflow_seen % self._sample_rate == 0
+        return False
+
+    async def _run_writer(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = loop.time() + self._flush_interval
+            while len(batch) < self._batch_size:
+                item = self._next_nowait()
+                if item is None:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            try:
+                await asyncio.to_thread(self._write_batch, batch)
+            except Exception as exc:
+                # هر خطایی (ساخت پوشه ماه جدید، تبدیل ورودی به JSON و ...) فقط همین دسته را از دست می‌دهد
+                self._counters["dropped"] += len(batch)
+                self._logger.error("نوشتن %d لاگ با خطا مواجه شد: %r", len(batch), exc)
+
+    def _next_nowait(self) -> Union[dict, object, None]:
+        try:
+            return self._queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return None
+
+    def _write_batch(self, entries: List[dict]) -> None:
+        self._rollover()
+        batches: Dict[Path, List[dict]] = {self._json_file: entries}
+        errors = [entry for entry in entries if entry["level"] == "ERROR"]
+        if errors:
+            batches[self._errors_file] = errors
+        self._append_batches(batches)
+        self._counters["written"] += len(entries)
+        self._counters["batches"] += 1
+
+    def _append_batches(self, batches: Dict[Path, List[dict]]) -> None:
+        for path, entries in batches.items():
+            self._append(path, entries)
 
-    async def _append(self, path, entry) -> None:
+    def _append(self, path: Optional[Path], entries: Iterable[dict]) -> None:
         if not path:
             return
         try:
-            if path.exists():
-                try:
-                    data = json.loads(path.read_text(encoding="utf-8"))
-                    if not isinstance(data, list):
-                        data = []
-                except json.JSONDecodeError:
-                    data = []
-            else:
-                data = []
-            data.append(entry)
-            path.write_text(
-                json.dumps(data, ensure_ascii=False, indent=2),
-                encoding="utf-8",
-            )
+            with path.open("a", encoding="utf-8") as handle:
+                handle.write("".join(_encode(entry) for entry in entries))
         except OSError:
-            self._logger.error("نوشتن لاگ در فایل JSON با خطا مواجه شد.")
+            self._logger.error("نوشتن لاگ در فایل JSONL با خطا مواجه شد.")
@@ -0,0 +1,169 @@
+import asyncio
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from aiogram.exceptions import (
+    TelegramBadRequest,
+    TelegramForbiddenError,
+    TelegramNetworkError,
+    TelegramRetryAfter,
+    TelegramServerError,
+)
+
+from core.rate_limit import TokenBucket
+from services.project_formatter import project_profile_text
+
+_STOP = object()
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationService:
+    """
+    Fans project updates out to the update groups in the background.
+    Updates to one project within `coalesce_window` seconds are merged into a single message
+    carrying the latest state; sends are paced by a global and a per-group token bucket
+    and 429 responses are retried after the `retry_after` Telegram asks for.
+    """
+
+    def __init__(
+        self,
+        bot,
+        chat_ids: Iterable[int],
+        coalesce_window: float = 2.0,
+        global_rate: float = 30.0,
+        group_rate: float = 20.0,
+        max_retries: int = 3,
+        queue_size: int = 1000,
+        log_service=None,
+    ) -> None:
+        self._bot = bot
+        self._log_service = log_service
+        self._chat_ids: List[int] = list(dict.fromkeys(chat_ids))
+        self._coalesce_window = max(0.0, coalesce_window)
+        # محدودیت تلگرام: حدود ۳۰ پیام در ثانیه در کل و ۲۰ پیام در دقیقه برای هر گروه
+        self._global_bucket = TokenBucket(global_rate, global_rate)
+        self._group_rate = max(group_rate, 1.0) / 60.0
+        self._max_retries = max(0, max_retries)
+        self._queue_size = max(1, queue_size)
+        # project_id -> (prefix, آخرین وضعیت پروژه)
+        self._pending: Dict[int, Tuple[str, dict]] = {}
+        self._timers: Dict[int, asyncio.TimerHandle] = {}
+        self._queues: Dict[int, asyncio.Queue] = {}
+        self._buckets: Dict[int, TokenBucket] = {}
+        self._workers: Dict[int, asyncio.Task] = {}
+        self._counters = {"queued": 0, "coalesced": 0, "sent": 0, "retried": 0, "failed": 0, "dropped": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._chat_ids)
+
+    async def start(self) -> None:
+        if self._workers or not self._chat_ids:
+            return
+        for chat_id in self._chat_ids:
+            self._queues[chat_id] = asyncio.Queue(maxsize=self._queue_size)
+            self._buckets[chat_id] = TokenBucket(self._group_rate, 3)
+            self._workers[chat_id] = asyncio.create_task(self._run_sender(chat_id))
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Send coalesced updates that are still waiting, drain the queues and stop the senders."""
+        if not self._workers:
+            return
+        for project_id in list(self._timers):
+            self._timers.pop(project_id).cancel()
+            self._flush(project_id)
+        for chat_id, queue in self._queues.items():
+            try:
+                queue.put_nowait(_STOP)
+            except asyncio.QueueFull:
+                # صف پر با سرعت ۲۰ پیام در دقیقه در مهلت خاموش شدن خالی نمی‌شود
+                self._counters["dropped"] += queue.qsize()
+                self._workers[chat_id].cancel()
+        _, pending = await asyncio.wait(self._workers.values(), timeout=timeout)
+        for task in pending:
+            task.cancel()
+        self._workers = {}
+        self._queues = {}
+
+    def stats(self) -> Dict[str, int]:
+        pending = sum(queue.qsize() for queue in self._queues.values())
+        return {**self._counters, "waiting": len(self._pending), "pending": pending}
+
+    def notify(self, project: Optional[dict], prefix: str) -> None:
+        """Schedule a message about `project`; returns immediately."""
+        if not project or not self._workers:
+            return
+        project_id = project["id"]
+        existing = self._pending.get(project_id)
+        if existing is not None:
+            # پیشوند اولین رویداد حفظ می‌شود (مثلاً «ایجاد شد»)، متن از آخرین وضعیت ساخته می‌شود
+            self._pending[project_id] = (existing[0], project)
+            self._counters["coalesced"] += 1
+            return
+        self._pending[project_id] = (prefix, project)
+        if self._coalesce_window == 0:
+            self._flush(project_id)
+            return
+        loop = asyncio.get_running_loop()
+        self._timers[project_id] = loop.call_later(self._coalesce_window, self._on_window_closed, project_id)
+
+    def _on_window_closed(self, project_id: int) -> None:
+        self._timers.pop(project_id, None)
+        self._flush(project_id)
+
+    def _flush(self, project_id: int) -> None:
+        entry = self._pending.pop(project_id, None)
+        if entry is None:
+            return
+        prefix, project = entry
+        text = f"{prefix}\n{project_profile_text(project)}"
+        for queue in self._queues.values():
+            try:
+                queue.put_nowait(text)
+            except asyncio.QueueFull:
+                self._counters["dropped"] += 1
+                continue
+            self._counters["queued"] += 1
+
+    async def _run_sender(self, chat_id: int) -> None:
+        queue = self._queues[chat_id]
+        bucket = self._buckets[chat_id]
+        while True:
+            text = await queue.get()
+            if text is _STOP:
+                return
+            try:
+                await self._send(chat_id, bucket, text)
+            except Exception as exc:
+                # خطای پیش‌بینی‌نشده نباید ارسال‌کننده این گروه را برای همیشه متوقف کند
+                self._counters["failed"] += 1
+                await self._log_error(f"ارسال اطلاع‌رسانی به گروه {chat_id} با خطا مواجه شد: {exc!r}")
+
+    async def _log_error(self, message: str) -> None:
+        if self._log_service is not None:
+            await self._log_service.error(message)
+        else:
+            logger.error(message)
+
+    async def _send(self, chat_id: int, bucket: TokenBucket, text: str) -> None:
+        for attempt in range(self._max_retries + 1):
+            await bucket.acquire()
+            await self._global_bucket.acquire()
+            try:
+                await self._bot.send_message(chat_id=chat_id, text=text)
+            except TelegramRetryAfter as exc:
+                delay = float(exc.retry_after)
+            except (TelegramNetworkError, TelegramServerError):
+                delay = float(2 ** attempt)
+            except (TelegramBadRequest, TelegramForbiddenError):
+                # گروه در دسترس نیست یا بات عضو آن نیست؛ تلاش دوباره فایده‌ای ندارد
+                break
+            else:
+                self._counters["sent"] += 1
+                return
+            if attempt == self._max_retries:
+                break
+            self._counters["retried"] += 1
+            await asyncio.sleep(delay)
+        self._counters["failed"] += 1
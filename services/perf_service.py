@@ -0,0 +1,158 @@
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, List, NamedTuple, Optional
+
+from core.perf import Trace
+from core.utils import log_directory
+
+PERF_FILE = "perf.jsonl"
+
+logger = logging.getLogger(__name__)
+
+
+class _Sample(NamedTuple):
+    wall: float
+    db_calls: int
+    db_time: float
+    api_calls: int
+    api_time: float
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class PerfRecorder:
+    """
+    Keeps the last `window` samples of every handler and reports rolling p50/p95/p99
+    together with the average number of queries and the time spent in SQLite and the Bot API.
+    Handlers slower than `slow_threshold_ms` are logged with their per-query breakdown and
+    a snapshot is appended to logs/YYYY/MM/perf.jsonl every `dump_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        window: int = 1000,
+        slow_threshold_ms: float = 500.0,
+        dump_interval: float = 300.0,
+        log_service=None,
+        logs_root: Optional[str] = None,
+    ) -> None:
+        self._window = max(1, window)
+        self._slow_threshold = max(0.0, slow_threshold_ms) / 1000
+        self._dump_interval = max(0.0, dump_interval)
+        self._log_service = log_service
+        self._logs_root = logs_root
+        self._samples: Dict[str, Deque[_Sample]] = {}
+        self._totals: Dict[str, int] = {}
+        self._dump_task: Optional[asyncio.Task] = None
+        self._started = time.time()
+
+    async def start(self) -> None:
+        if self._dump_task is not None or not self._logs_root or not self._dump_interval:
+            return
+        self._dump_task = asyncio.create_task(self._run_dump())
+
+    async def stop(self) -> None:
+        if self._dump_task is None:
+            return
+        self._dump_task.cancel()
+        try:
+            await self._dump_task
+        except asyncio.CancelledError:
+            pass
+        self._dump_task = None
+        try:
+            await self.dump()
+        except Exception as exc:
+            # خطای نوشتن آخرین آمار نباید بستن سرویس لاگ و پایگاه داده را متوقف کند
+            await self._report_dump_error(exc)
+
+    async def record(self, trace: Trace, wall: float) -> None:
+        name = trace.handler
+        samples = self._samples.get(name)
+        if samples is None:
+            samples = self._samples[name] = deque(maxlen=self._window)
+        samples.append(_Sample(wall, trace.db_calls, trace.db_time, trace.api_calls, trace.api_time))
+        self._totals[name] = self._totals.get(name, 0) + 1
+        if self._slow_threshold and wall >= self._slow_threshold and self._log_service is not None:
+            await self._log_service.warning(self._slow_message(trace, wall))
+
+    @staticmethod
+    def _slow_message(trace: Trace, wall: float) -> str:
+        breakdown = ", ".join(
+            f"{name}×{int(calls)}={seconds * 1000:.1f}ms"
+            for name, (calls, seconds) in sorted(trace.queries.items(), key=lambda item: item[1][1], reverse=True)
+        )
+        return (
+            f"هندلر کند {trace.handler}: {wall * 1000:.1f}ms "
+            f"(DB {trace.db_calls} کوئری {trace.db_time * 1000:.1f}ms، "
+            f"API {trace.api_calls} درخواست {trace.api_time * 1000:.1f}ms) "
+            f"[{breakdown or '—'}]"
+        )
+
+    def snapshot(self) -> List[dict]:
+        """One row per handler, slowest p95 first; times are in milliseconds."""
+        result = []
+        for name, samples in list(self._samples.items()):
+            if not samples:
+                continue
+            count = len(samples)
+            walls = sorted(sample.wall for sample in samples)
+            result.append(
+                {
+                    "handler": name,
+                    "total": self._totals.get(name, count),
+                    "window": count,
+                    "p50_ms": round(_percentile(walls, 0.50) * 1000, 2),
+                    "p95_ms": round(_percentile(walls, 0.95) * 1000, 2),
+                    "p99_ms": round(_percentile(walls, 0.99) * 1000, 2),
+                    "db_calls": round(sum(sample.db_calls for sample in samples) / count, 2),
+                    "db_ms": round(sum(sample.db_time for sample in samples) * 1000 / count, 2),
+                    "api_calls": round(sum(sample.api_calls for sample in samples) / count, 2),
+                    "api_ms": round(sum(sample.api_time for sample in samples) * 1000 / count, 2),
+                }
+            )
+        result.sort(key=lambda item: item["p95_ms"], reverse=True)
+        return result
+
+    def reset(self) -> None:
+        self._samples.clear()
+        self._totals.clear()
+
+    async def dump(self) -> None:
+        """Append a snapshot to perf.jsonl; the snapshot is taken on the loop, only the write runs in a thread."""
+        handlers = self.snapshot()
+        if not handlers or not self._logs_root:
+            return
+        entry = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "uptime_s": round(time.time() - self._started),
+            "handlers": handlers,
+        }
+        await asyncio.to_thread(self._write, json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def _write(self, line: str) -> None:
+        path = log_directory(self._logs_root) / PERF_FILE
+        with path.open("a", encoding="utf-8") as handle:
+            handle.write(line)
+
+    async def _report_dump_error(self, exc: Exception) -> None:
+        message = f"نوشتن آمار کارایی در perf.jsonl با خطا مواجه شد: {exc!r}"
+        if self._log_service is not None:
+            await self._log_service.error(message)
+        else:
+            logger.error(message)
+
+    async def _run_dump(self) -> None:
+        while True:
+            await asyncio.sleep(self._dump_interval)
+            try:
+                await self.dump()
+            except Exception as exc:
+                await self._report_dump_error(exc)
@@ -1,9 +1,14 @@
 from typing import Dict
 
+from core.render_cache import render_cache
 from core.utils import human_status
 
 
 def project_profile_text(project: Dict) -> str:
+    return render_cache.profile(project, _render_profile)
+
+
+def _render_profile(project: Dict) -> str:
     end_date = project.get("end_date") or "—"
     owner = project.get("owner_name") or "—"
     description = project.get("description") or "—"
@@ -0,0 +1,185 @@
+import bisect
+from typing import Dict, List, Optional
+
+from core.constants import VISIBLE_STATUSES
+from db.queries import register
+from db.records import Project
+
+LOAD_ALL = register("projects.load_all", f"SELECT {Project.COLUMNS} FROM projects", allow_scan=True, record=Project)
+
+_SUMMARY_FIELDS = ("id", "title", "status")
+
+
+def _insert(ids: List[int], project_id: int) -> None:
+    index = bisect.bisect_left(ids, project_id)
+    if index == len(ids) or ids[index] != project_id:
+        ids.insert(index, project_id)
+
+
+def _remove(ids: List[int], project_id: int) -> None:
+    index = bisect.bisect_left(ids, project_id)
+    if index < len(ids) and ids[index] == project_id:
+        del ids[index]
+
+
+class ProjectReadModel:
+    """
+    In-memory copy of the projects table indexed by id, status and owner.
+    ProjectService hands it every row a committed write returns, so it never reads SQLite after
+    load(); SQLite stays the source of truth and verify() compares the two on demand.
+    Reads return fresh Project records shaped like the equivalent SQL query results, newest id first.
+    """
+
+    def __init__(self) -> None:
+        self._rows: Dict[int, Project] = {}
+        # شناسه‌های پروژه‌های حذف‌نشده به ترتیب صعودی تا صفحه‌بندی keyset با bisect انجام شود
+        self._live: List[int] = []
+        self._by_status: Dict[str, List[int]] = {}
+        self._by_owner: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    async def load(self, database) -> int:
+        rows = await database.fetchall(LOAD_ALL)
+        self._rows.clear()
+        self._live.clear()
+        self._by_status.clear()
+        self._by_owner.clear()
+        for row in rows:
+            self._index(row)
+        return len(rows)
+
+    def apply(self, row: Project) -> None:
+        """Store a row returned by a committed write; an older row_version never replaces a newer one."""
+        current = self._rows.get(row["id"])
+        if current is not None:
+            if row.get("row_version", 0) < current.get("row_version", 0):
+                return
+            self._unindex(current)
+        self._index(row)
+
+    async def verify(self, database) -> List[int]:
+        """Ids whose in-memory row differs from SQLite, including rows missing on either side."""
+        stored = {row["id"]: row for row in await database.fetchall(LOAD_ALL)}
+        return sorted(
+            project_id
+            for project_id in stored.keys() | self._rows.keys()
+            if stored.get(project_id) != self._rows.get(project_id)
+        )
+
+    def _index(self, row: Project) -> None:
+        project_id = row["id"]
+        self._rows[project_id] = row
+        if row["status"] == "deleted":
+            return
+        _insert(self._live, project_id)
+        _insert(self._by_status.setdefault(row["status"], []), project_id)
+        if row["owner_name"] is not None:
+            _insert(self._by_owner.setdefault(row["owner_name"], []), project_id)
+
+    def _unindex(self, row: Project) -> None:
+        if row["status"] == "deleted":
+            return
+        project_id = row["id"]
+        _remove(self._live, project_id)
+        _remove(self._by_status.get(row["status"], []), project_id)
+        if row["owner_name"] is not None:
+            _remove(self._by_owner.get(row["owner_name"], []), project_id)
+
+    def _visible_ids(self, role: str, owner_name: Optional[str], status: Optional[str] = None) -> List[int]:
+        if status is None:
+            if role != "admin":
+                return self._by_owner.get(owner_name, [])
+            return self._live
+        if status == "deleted":
+            return []
+        if role != "admin":
+            return [
+                project_id
+                for project_id in self._by_owner.get(owner_name, [])
+                if self._rows[project_id]["status"] == status
+            ]
+        return self._by_status.get(status, [])
+
+    def _summary(self, project_id: int) -> Project:
+        row = self._rows[project_id]
+        return Project.from_values(_SUMMARY_FIELDS, [row[field] for field in _SUMMARY_FIELDS])
+
+    def get(self, project_id: int, include_deleted: bool = False) -> Optional[Project]:
+        row = self._rows.get(project_id)
+        if row is None or (row["status"] == "deleted" and not include_deleted):
+            return None
+        return row.copy()
+
+    def rows(self, role: str, owner_name: Optional[str]) -> List[Project]:
+        return [self._rows[project_id].copy() for project_id in reversed(self._visible_ids(role, owner_name))]
+
+    def summaries(self, role: str, owner_name: Optional[str]) -> List[Project]:
+        return [self._summary(project_id) for project_id in reversed(self._visible_ids(role, owner_name))]
+
+    def page_after(
+        self, role: str, owner_name: Optional[str], cursor: int, limit: int, status: Optional[str] = None
+    ) -> List[Project]:
+        """Up to `limit` summaries with id below `cursor`, newest first."""
+        ids = self._visible_ids(role, owner_name, status)
+        end = bisect.bisect_left(ids, cursor)
+        return [self._summary(project_id) for project_id in reversed(ids[max(0, end - limit):end])]
+
+    def page_before(
+        self, role: str, owner_name: Optional[str], cursor: int, limit: int, status: Optional[str] = None
+    ) -> List[Project]:
+        """Up to `limit` summaries with id above `cursor`, oldest first."""
+        ids = self._visible_ids(role, owner_name, status)
+        start = bisect.bisect_right(ids, cursor)
+        return [self._summary(project_id) for project_id in ids[start:start + limit]]
+
+    def query(
+        self,
+        status: Optional[str] = None,
+        owner_name: Optional[str] = None,
+        start_from: Optional[str] = None,
+        start_to: Optional[str] = None,
+        end_from: Optional[str] = None,
+        end_to: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Project]:
+        if status is not None:
+            ids = self._by_status.get(status, [])
+        elif owner_name is not None:
+            ids = self._by_owner.get(owner_name, [])
+        else:
+            ids = self._live
+        result = []
+        for project_id in reversed(ids):
+            row = self._rows[project_id]
+            # مثل SQL، مقایسه با NULL هیچ ردیفی را برنمی‌گرداند
+            if owner_name is not None and row["owner_name"] != owner_name:
+                continue
+            if status is not None and row["status"] != status:
+                continue
+            start, end = row["start_date"], row["end_date"]
+            if (start_from is not None or start_to is not None) and start is None:
+                continue
+            if (end_from is not None or end_to is not None) and end is None:
+                continue
+            if (start_from is not None and start < start_from) or (start_to is not None and start > start_to):
+                continue
+            if (end_from is not None and end < end_from) or (end_to is not None and end > end_to):
+                continue
+            result.append(self._summary(project_id))
+            if limit is not None and len(result) >= limit:
+                break
+        return result
+
+    def status_counts(self, role: str, owner_name: Optional[str]) -> Dict[str, int]:
+        counts = {status: 0 for status in VISIBLE_STATUSES}
+        if role == "admin":
+            for status in counts:
+                counts[status] = len(self._by_status.get(status, []))
+            return counts
+        for project_id in self._by_owner.get(owner_name, []):
+            status = self._rows[project_id]["status"]
+            if status in counts:
+                counts[status] += 1
+        return counts
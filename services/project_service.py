@@ -1,12 +1,234 @@
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
 from core.constants import STATUS_CHOICES, VISIBLE_STATUSES
+from db.queries import register
+from db.records import OwnerHistory, Project
+
+INSERT_PROJECT = register(
+    "projects.insert",
+    f"""
+    INSERT INTO projects(title, description, status, owner_name, start_date, end_date, version, version_updated_at, deleted_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, NULL)
+    RETURNING {Project.COLUMNS}
+    """,
+    record=Project,
+)
+GROUPED_ALL = register(
+    "projects.grouped_all",
+    f"SELECT {Project.COLUMNS} FROM projects WHERE status != 'deleted' ORDER BY id DESC",
+    expect_index="idx_projects_live",
+    record=Project,
+)
+GROUPED_BY_OWNER = register(
+    "projects.grouped_by_owner",
+    f"SELECT {Project.COLUMNS} FROM projects WHERE status != 'deleted' AND owner_name = ? ORDER BY id DESC",
+    record=Project,
+)
+LIST_ALL = register(
+    "projects.list_all",
+    "SELECT id, title, status FROM projects WHERE status != 'deleted' ORDER BY id DESC",
+    expect_index="idx_projects_live",
+    record=Project,
+)
+LIST_BY_OWNER = register(
+    "projects.list_by_owner",
+    "SELECT id, title, status FROM projects WHERE status != 'deleted' AND owner_name = ? ORDER BY id DESC",
+    record=Project,
+)
+PAGE_ALL_AFTER = register(
+    "projects.page_all_after",
+    "SELECT id, title, status FROM projects WHERE status != 'deleted' AND id < ? ORDER BY id DESC LIMIT ?",
+    record=Project,
+)
+PAGE_ALL_BEFORE = register(
+    "projects.page_all_before",
+    "SELECT id, title, status FROM projects WHERE status != 'deleted' AND id > ? ORDER BY id ASC LIMIT ?",
+    record=Project,
+)
+PAGE_OWNER_AFTER = register(
+    "projects.page_owner_after",
+    "SELECT id, title, status FROM projects WHERE status != 'deleted' AND owner_name = ? AND id < ? ORDER BY id DESC LIMIT ?",
+    record=Project,
+)
+PAGE_OWNER_BEFORE = register(
+    "projects.page_owner_before",
+    "SELECT id, title, status FROM projects WHERE status != 'deleted' AND owner_name = ? AND id > ? ORDER BY id ASC LIMIT ?",
+    record=Project,
+)
+PAGE_STATUS_AFTER = register(
+    "projects.page_status_after",
+    "SELECT id, title, status FROM projects WHERE status != 'deleted' AND status = ? AND id < ? ORDER BY id DESC LIMIT ?",
+    record=Project,
+)
+PAGE_STATUS_BEFORE = register(
+    "projects.page_status_before",
+    "SELECT id, title, status FROM projects WHERE status != 'deleted' AND status = ? AND id > ? ORDER BY id ASC LIMIT ?",
+    record=Project,
+)
+PAGE_OWNER_STATUS_AFTER = register(
+    "projects.page_owner_status_after",
+    """
+    SELECT id, title, status FROM projects
+    WHERE status != 'deleted' AND owner_name = ? AND status = ? AND id < ? ORDER BY id DESC LIMIT ?
+    """,
+    record=Project,
+)
+PAGE_OWNER_STATUS_BEFORE = register(
+    "projects.page_owner_status_before",
+    """
+    SELECT id, title, status FROM projects
+    WHERE status != 'deleted' AND owner_name = ? AND status = ? AND id > ? ORDER BY id ASC LIMIT ?
+    """,
+    record=Project,
+)
+STATUS_COUNTS_ALL = register(
+    "projects.status_counts_all",
+    "SELECT status, COUNT(*) AS total FROM projects WHERE status != 'deleted' GROUP BY status",
+    expect_index="idx_projects_status",
+)
+STATUS_COUNTS_BY_OWNER = register(
+    "projects.status_counts_by_owner",
+    "SELECT status, COUNT(*) AS total FROM projects WHERE owner_name = ? AND status != 'deleted' GROUP BY status",
+)
+GET_PROJECT = register(
+    "projects.get",
+    f"SELECT {Project.COLUMNS} FROM projects WHERE id = ? AND status != 'deleted'",
+    record=Project,
+)
+GET_PROJECT_ANY = register(
+    "projects.get_any",
+    f"SELECT {Project.COLUMNS} FROM projects WHERE id = ?",
+    record=Project,
+)
+UPDATE_STATUS = register(
+    "projects.update_status",
+    f"UPDATE projects SET status = ?, end_date = ?, version = COALESCE(?, version), version_updated_at = COALESCE(?, version_updated_at), deleted_at = NULL, row_version = row_version + 1 WHERE id = ? RETURNING {Project.COLUMNS}",
+    record=Project,
+)
+UPDATE_OWNER = register(
+    "projects.update_owner",
+    f"UPDATE projects SET owner_name = ?, row_version = row_version + 1 WHERE id = ? RETURNING {Project.COLUMNS}",
+    record=Project,
+)
+UPDATE_TITLE = register(
+    "projects.update_title",
+    f"UPDATE projects SET title = ?, row_version = row_version + 1 WHERE id = ? RETURNING {Project.COLUMNS}",
+    record=Project,
+)
+UPDATE_DESCRIPTION = register(
+    "projects.update_description",
+    f"UPDATE projects SET description = ?, row_version = row_version + 1 WHERE id = ? RETURNING {Project.COLUMNS}",
+    record=Project,
+)
+SOFT_DELETE = register(
+    "projects.soft_delete",
+    f"UPDATE projects SET status = 'deleted', deleted_at = ?, row_version = row_version + 1 WHERE id = ? RETURNING {Project.COLUMNS}",
+    record=Project,
+)
+OWNER_HISTORY = register(
+    "owner_history.list",
+    """
+    SELECT project_id, owner_name, from_date, to_date
+    FROM project_owner_history
+    WHERE project_id = ?
+    ORDER BY id ASC
+    """,
+    record=OwnerHistory,
+)
+ADD_OWNER_HISTORY = register(
+    "owner_history.insert",
+    """
+    INSERT INTO project_owner_history(project_id, owner_name, from_date, to_date)
+    VALUES (?, ?, ?, NULL)
+    """,
+)
+CLOSE_OWNER_HISTORY = register(
+    "owner_history.close",
+    "UPDATE project_owner_history SET to_date = ? WHERE project_id = ? AND to_date IS NULL",
+)
+INSERT_VERSION = register(
+    "versions.insert",
+    """
+    INSERT INTO project_versions(project_id, version, changed_at)
+    VALUES (?, ?, ?)
+    """,
+)
+
+ProjectChangeListener = Callable[[int], None]
+
+# شرط‌های قابل‌ترکیب query_projects؛ هر ترکیب یک کوئری ثبت‌شده جدا با متن ثابت است
+_FILTER_CLAUSES = (
+    ("status", "status = ?"),
+    ("owner_name", "owner_name = ?"),
+    ("start_from", "start_date >= ?"),
+    ("start_to", "start_date <= ?"),
+    ("end_from", "end_date >= ?"),
+    ("end_to", "end_date <= ?"),
+)
+
+
+def _filter_query(fields: Tuple[str, ...], limited: bool):
+    clauses = ["status != 'deleted'"] + [clause for name, clause in _FILTER_CLAUSES if name in fields]
+    sql = f"SELECT id, title, status FROM projects WHERE {' AND '.join(clauses)} ORDER BY id DESC"
+    name = "projects.filter:" + ("+".join(fields) or "all")
+    if limited:
+        sql += " LIMIT ?"
+        name += ":limit"
+    return register(name, sql, record=Project)
+
+# بزرگ‌ترین شناسه ممکن در SQLite؛ کرسر صفحه اول
+FIRST_PAGE_CURSOR = 2**63 - 1
+
+
+@dataclass
+class ProjectPage:
+    items: List[Project]
+    has_next: bool
+    has_prev: bool
+
+    @property
+    def first_id(self) -> int:
+        return self.items[0]["id"] if self.items else 0
+
+    @property
+    def last_id(self) -> int:
+        return self.items[-1]["id"] if self.items else 0
 
 
 class ProjectService:
-    def __init__(self, database):
+    def __init__(self, database, read_model=None):
+        """`read_model` (a loaded ProjectReadModel) serves project reads from memory when given."""
         self._db = database
+        self._read_model = read_model
+        self._listeners: List[ProjectChangeListener] = []
+
+    def subscribe(self, listener: ProjectChangeListener) -> None:
+        """Register a callback invoked as listener(project_id) after a project row changes."""
+        self._listeners.append(listener)
+
+    def _notify(self, project_id: int) -> None:
+        for listener in self._listeners:
+            listener(project_id)
+
+    def _changed(self, project: Project) -> None:
+        """Called with the row a committed write returned."""
+        if self._read_model is not None:
+            self._read_model.apply(project)
+        self._notify(project["id"])
+
+    async def verify_read_model(self) -> Optional[List[int]]:
+        """
+        Compare the read model with SQLite; None when it is disabled, otherwise the ids that differed.
+        On a mismatch the model is reloaded from SQLite.
+        """
+        if self._read_model is None:
+            return None
+        mismatched = await self._read_model.verify(self._db)
+        if mismatched:
+            await self._read_model.load(self._db)
+        return mismatched
 
     def _today(self) -> str:
         return datetime.utcnow().strftime("%Y-%m-%d")
@@ -21,7 +243,7 @@ class ProjectService:
         end_date: Optional[str] = None,
         version: str = "0",
         version_date: Optional[str] = None,
-    ) -> int:
+    ) -> Optional[Project]:
         if status not in STATUS_CHOICES:
             raise ValueError("وضعیت انتخاب شده معتبر نیست")
         if status == "done" and not end_date:
@@ -30,54 +252,141 @@ class ProjectService:
             raise ValueError("ورژن برای وضعیت تکمیل شده الزامی است")
         version_value = version if status == "done" else "0"
         version_updated_at = version_date or (end_date if status == "done" else None)
-        await self._db.execute(
-            """
-            INSERT INTO projects(title, description, status, owner_name, start_date, end_date, version, version_updated_at, deleted_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, NULL)
-            """,
-            (title, description, status, owner_name, start_date, end_date, version_value, version_updated_at),
-        )
-        row = await self._db.fetchone(
-            "SELECT id FROM projects WHERE title = ? ORDER BY id DESC LIMIT 1",
-            (title,),
-        )
-        project_id = row["id"] if row else 0
-        if owner_name:
-            await self._add_owner_history(project_id, owner_name, start_date)
-        if status == "done":
-            await self._record_version(project_id, version_value, version_date or end_date)
-        return project_id
-
-    async def grouped(self, role: str, owner_name: Optional[str]) -> Dict[str, List[dict]]:
-        params = []
-        base_query = "SELECT * FROM projects WHERE status != 'deleted'"
-        if role != "admin":
-            base_query += " AND owner_name = ?"
-            params.append(owner_name)
-        base_query += " ORDER BY id DESC"
-        rows = await self._db.fetchall(base_query, tuple(params))
-        result: Dict[str, List[dict]] = {status: [] for status in VISIBLE_STATUSES}
+        async with self._db.transaction() as tx:
+            project = await tx.execute_returning(
+                INSERT_PROJECT,
+                (title, description, status, owner_name, start_date, end_date, version_value, version_updated_at),
+            )
+            if not project:
+                return None
+            if owner_name:
+                await self._add_owner_history(tx, project["id"], owner_name, start_date)
+            if status == "done":
+                await self._record_version(tx, project["id"], version_value, version_date or end_date)
+        self._changed(project)
+        return project
+
+    async def grouped(self, role: str, owner_name: Optional[str]) -> Dict[str, List[Project]]:
+        if self._read_model is not None:
+            rows = self._read_model.rows(role, owner_name)
+        elif role != "admin":
+            rows = await self._db.fetchall(GROUPED_BY_OWNER, (owner_name,))
+        else:
+            rows = await self._db.fetchall(GROUPED_ALL)
+        result: Dict[str, List[Project]] = {status: [] for status in VISIBLE_STATUSES}
         for row in rows:
             if row["status"] in result:
                 result[row["status"]].append(row)
         return result
 
-    async def list_for_updates(self, role: str, owner_name: Optional[str]) -> List[dict]:
-        params = []
-        base_query = "SELECT id, title, status FROM projects WHERE status != 'deleted'"
+    async def list_for_updates(self, role: str, owner_name: Optional[str]) -> List[Project]:
+        if self._read_model is not None:
+            return self._read_model.summaries(role, owner_name)
+        if role != "admin":
+            return await self._db.fetchall(LIST_BY_OWNER, (owner_name,))
+        return await self._db.fetchall(LIST_ALL)
+
+    async def list_page(
+        self,
+        role: str,
+        owner_name: Optional[str],
+        cursor: Optional[int] = None,
+        limit: int = 20,
+        backward: bool = False,
+        status: Optional[str] = None,
+    ) -> ProjectPage:
+        """
+        Keyset page of live projects, newest first, optionally only those in `status`. Forward pages
+        hold ids below `cursor` (use the previous page's last_id); backward pages hold ids above it
+        (use first_id).
+        """
+        limit = max(1, limit)
+        if backward and cursor is not None:
+            rows = await self._page_rows(role, owner_name, status, cursor, limit + 1, backward=True)
+            if not rows:
+                return await self.list_page(role, owner_name, limit=limit, status=status)
+            has_prev = len(rows) > limit
+            return ProjectPage(items=list(reversed(rows[:limit])), has_next=True, has_prev=has_prev)
+        after = FIRST_PAGE_CURSOR if cursor is None else cursor
+        rows = await self._page_rows(role, owner_name, status, after, limit + 1, backward=False)
+        return ProjectPage(items=rows[:limit], has_next=len(rows) > limit, has_prev=cursor is not None)
+
+    async def _page_rows(
+        self,
+        role: str,
+        owner_name: Optional[str],
+        status: Optional[str],
+        cursor: int,
+        limit: int,
+        backward: bool,
+    ) -> List[Project]:
+        if self._read_model is not None:
+            if backward:
+                return self._read_model.page_before(role, owner_name, cursor, limit, status)
+            return self._read_model.page_after(role, owner_name, cursor, limit, status)
+        if role != "admin":
+            if status is not None:
+                query = PAGE_OWNER_STATUS_BEFORE if backward else PAGE_OWNER_STATUS_AFTER
+                return await self._db.fetchall(query, (owner_name, status, cursor, limit))
+            query = PAGE_OWNER_BEFORE if backward else PAGE_OWNER_AFTER
+            return await self._db.fetchall(query, (owner_name, cursor, limit))
+        if status is not None:
+            query = PAGE_STATUS_BEFORE if backward else PAGE_STATUS_AFTER
+            return await self._db.fetchall(query, (status, cursor, limit))
+        query = PAGE_ALL_BEFORE if backward else PAGE_ALL_AFTER
+        return await self._db.fetchall(query, (cursor, limit))
+
+    async def query_projects(
+        self,
+        status: Optional[str] = None,
+        owner_name: Optional[str] = None,
+        start_from: Optional[str] = None,
+        start_to: Optional[str] = None,
+        end_from: Optional[str] = None,
+        end_to: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Project]:
+        """
+        Live projects matching every given filter, newest first. Dates are inclusive `YYYY-MM-DD` bounds;
+        filters left as None are not applied.
+        """
+        if self._read_model is not None:
+            return self._read_model.query(
+                status, owner_name, start_from, start_to, end_from, end_to, None if limit is None else max(1, limit)
+            )
+        values = {
+            "status": status,
+            "owner_name": owner_name,
+            "start_from": start_from,
+            "start_to": start_to,
+            "end_from": end_from,
+            "end_to": end_to,
+        }
+        fields = tuple(name for name, _ in _FILTER_CLAUSES if values[name] is not None)
+        params = [values[name] for name in fields]
+        if limit is not None:
+            params.append(max(1, limit))
+        return await self._db.fetchall(_filter_query(fields, limit is not None), tuple(params))
+
+    async def status_counts(self, role: str, owner_name: Optional[str]) -> Dict[str, int]:
+        if self._read_model is not None:
+            return self._read_model.status_counts(role, owner_name)
         if role != "admin":
-            base_query += " AND owner_name = ?"
-            params.append(owner_name)
-        base_query += " ORDER BY id DESC"
-        return await self._db.fetchall(base_query, tuple(params))
+            rows = await self._db.fetchall(STATUS_COUNTS_BY_OWNER, (owner_name,))
+        else:
+            rows = await self._db.fetchall(STATUS_COUNTS_ALL)
+        counts = {status: 0 for status in VISIBLE_STATUSES}
+        for row in rows:
+            if row["status"] in counts:
+                counts[row["status"]] = row["total"]
+        return counts
 
-    async def get_project(self, project_id: int, include_deleted: bool = False) -> Optional[dict]:
+    async def get_project(self, project_id: int, include_deleted: bool = False) -> Optional[Project]:
+        if self._read_model is not None:
+            return self._read_model.get(project_id, include_deleted)
         if include_deleted:
-            return await self._db.fetchone("SELECT * FROM projects WHERE id = ?", (project_id,))
-        return await self._db.fetchone(
-            "SELECT * FROM projects WHERE id = ? AND status != 'deleted'",
-            (project_id,),
-        )
+            return await self._db.fetchone(GET_PROJECT_ANY, (project_id,))
+        return await self._db.fetchone(GET_PROJECT, (project_id,))
 
     async def update_status(
         self,
@@ -86,7 +395,7 @@ class ProjectService:
         end_date: Optional[str] = None,
         version: Optional[str] = None,
         version_date: Optional[str] = None,
-    ) -> None:
+    ) -> Optional[Project]:
         if status == "deleted":
             raise ValueError("برای حذف از soft_delete_project استفاده کنید")
         if status not in STATUS_CHOICES:
@@ -98,80 +407,64 @@ class ProjectService:
         end_value = end_date if status == "done" else None
         version_value = version if status == "done" else None
         version_updated_at = version_date or end_value or (self._today() if status == "done" else None)
-        await self._db.execute(
-            "UPDATE projects SET status = ?, end_date = ?, version = COALESCE(?, version), version_updated_at = COALESCE(?, version_updated_at), deleted_at = NULL WHERE id = ?",
-            (status, end_value, version_value, version_updated_at, project_id),
-        )
-        if status == "done" and version_value:
-            await self._record_version(project_id, version_value, version_date or end_value)
-
-    async def update_owner(self, project_id: int, owner_name: Optional[str]) -> None:
-        project = await self.get_project(project_id, include_deleted=True)
-        if not project:
-            return
-        if project.get("owner_name") == owner_name:
-            return
-        now = self._today()
-        await self._close_open_owner_history(project_id, now)
-        await self._db.execute(
-            "UPDATE projects SET owner_name = ? WHERE id = ?",
-            (owner_name, project_id),
-        )
-        if owner_name:
-            await self._add_owner_history(project_id, owner_name, now)
-
-    async def update_title(self, project_id: int, title: str) -> None:
-        await self._db.execute(
-            "UPDATE projects SET title = ? WHERE id = ?",
-            (title, project_id),
-        )
-
-    async def update_description(self, project_id: int, description: str) -> None:
-        await self._db.execute(
-            "UPDATE projects SET description = ? WHERE id = ?",
-            (description, project_id),
-        )
+        async with self._db.transaction() as tx:
+            project = await tx.execute_returning(
+                UPDATE_STATUS,
+                (status, end_value, version_value, version_updated_at, project_id),
+            )
+            if project and status == "done" and version_value:
+                await self._record_version(tx, project_id, version_value, version_date or end_value)
+        if project:
+            self._changed(project)
+        return project
+
+    async def update_owner(self, project_id: int, owner_name: Optional[str]) -> Optional[Project]:
+        async with self._db.transaction() as tx:
+            project = await tx.fetchone(GET_PROJECT_ANY, (project_id,))
+            if not project:
+                return None
+            if project.get("owner_name") == owner_name:
+                return project
+            now = self._today()
+            await self._close_open_owner_history(tx, project_id, now)
+            project = await tx.execute_returning(
+                UPDATE_OWNER,
+                (owner_name, project_id),
+            )
+            if owner_name:
+                await self._add_owner_history(tx, project_id, owner_name, now)
+        self._changed(project)
+        return project
+
+    async def update_title(self, project_id: int, title: str) -> Optional[Project]:
+        project = await self._db.execute_returning(UPDATE_TITLE, (title, project_id))
+        if project:
+            self._changed(project)
+        return project
+
+    async def update_description(self, project_id: int, description: str) -> Optional[Project]:
+        project = await self._db.execute_returning(UPDATE_DESCRIPTION, (description, project_id))
+        if project:
+            self._changed(project)
+        return project
 
     async def soft_delete_project(self, project_id: int) -> None:
         now = self._today()
-        await self._db.execute(
-            "UPDATE projects SET status = 'deleted', deleted_at = ? WHERE id = ?",
-            (now, project_id),
-        )
-        await self._close_open_owner_history(project_id, now)
-
-    async def get_owner_history(self, project_id: int) -> List[dict]:
-        return await self._db.fetchall(
-            """
-            SELECT project_id, owner_name, from_date, to_date
-            FROM project_owner_history
-            WHERE project_id = ?
-            ORDER BY id ASC
-            """,
-            (project_id,),
-        )
-
-    async def _add_owner_history(self, project_id: int, owner_name: str, from_date: str) -> None:
-        await self._db.execute(
-            """
-            INSERT INTO project_owner_history(project_id, owner_name, from_date, to_date)
-            VALUES (?, ?, ?, NULL)
-            """,
-            (project_id, owner_name, from_date),
-        )
-
-    async def _close_open_owner_history(self, project_id: int, until: str) -> None:
-        await self._db.execute(
-            "UPDATE project_owner_history SET to_date = ? WHERE project_id = ? AND to_date IS NULL",
-            (until, project_id),
-        )
-
-    async def _record_version(self, project_id: int, version: str, changed_at: Optional[str]) -> None:
+        async with self._db.transaction() as tx:
+            project = await tx.execute_returning(SOFT_DELETE, (now, project_id))
+            await self._close_open_owner_history(tx, project_id, now)
+        if project:
+            self._changed(project)
+
+    async def get_owner_history(self, project_id: int) -> List[OwnerHistory]:
+        return await self._db.fetchall(OWNER_HISTORY, (project_id,))
+
+    async def _add_owner_history(self, tx, project_id: int, owner_name: str, from_date: str) -> None:
+        await tx.execute(ADD_OWNER_HISTORY, (project_id, owner_name, from_date))
+
+    async def _close_open_owner_history(self, tx, project_id: int, until: str) -> None:
+        await tx.execute(CLOSE_OWNER_HISTORY, (until, project_id))
+
+    async def _record_version(self, tx, project_id: int, version: str, changed_at: Optional[str]) -> None:
         timestamp = changed_at or self._today()
-        await self._db.execute(
-            """
-            INSERT INTO project_versions(project_id, version, changed_at)
-            VALUES (?, ?, ?)
-            """,
-            (project_id, version, timestamp),
-        )
+        await tx.execute(INSERT_VERSION, (project_id, version, timestamp))
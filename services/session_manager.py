@@ -1,15 +1,70 @@
+import asyncio
 import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional, Set
+from typing import Dict, List, Optional, Set
+
+from core.perf import detached_context
+from db.queries import register
+from db.records import User, as_record
+
+LOAD_PROFILES = register(
+    "session_profiles.load",
+    "SELECT user_id, data FROM session_profiles",
+    allow_scan=True,
+)
+UPSERT_PROFILE = register(
+    "session_profiles.upsert",
+    """
+    INSERT INTO session_profiles(user_id, data, updated_at) VALUES (?, ?, ?)
+    ON CONFLICT(user_id) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at
+    """,
+)
+DELETE_PROFILE = register("session_profiles.delete", "DELETE FROM session_profiles WHERE user_id = ?")
+
+# فاصله تلاش دوباره پس از شکست نوشتن، تا خطای ماندگار دیسک حلقه تنگ نسازد
+FLUSH_RETRY_DELAY = 5.0
+
+logger = logging.getLogger(__name__)
+
+
+def _load_profile(data) -> Optional[User]:
+    """Stored profile JSON as a User; None for entries that no longer match the users table."""
+    try:
+        return User(data)
+    except (KeyError, TypeError, ValueError):
+        return None
 
 
 class SessionManager:
-    def __init__(self, storage_path: str = "data/session_cache.json") -> None:
-        self._profiles: Dict[int, dict] = {}
+    def __init__(
+        self,
+        storage_path: str = "data/session_cache.json",
+        profile_ttl: float = 60.0,
+        save_delay: float = 0.5,
+        database=None,
+        inline_message_limit: int = 20,
+    ) -> None:
+        self._profiles: Dict[int, User] = {}
+        self._validated_at: Dict[int, float] = {}
+        self._profile_ttl = max(0.0, profile_ttl)
         self._pending_project: Dict[int, int] = {}
-        self._inline_messages: Dict[int, Set[int]] = {}
+        # پیام‌های دارای کیبورد اینلاین هر کاربر به ترتیب ارسال؛ قدیمی‌ترین‌ها با رسیدن به سقف کنار گذاشته می‌شوند
+        self._inline_messages: Dict[int, "OrderedDict[int, None]"] = {}
+        self._inline_message_limit = max(1, inline_message_limit)
         self._storage_path = Path(storage_path)
         self._storage_path.parent.mkdir(parents=True, exist_ok=True)
+        # با database پروفایل‌ها در جدول session_profiles و به‌ازای هر کاربر upsert می‌شوند
+        self._db = database
+        self._save_delay = max(0.0, save_delay)
+        self._dirty: Set[int] = set()
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
         self._load()
 
     def _load(self) -> None:
@@ -20,29 +75,120 @@ class SessionManager:
         except (json.JSONDecodeError, OSError):
             return
         if isinstance(data, dict):
-            self._profiles = {int(k): v for k, v in data.items()}
+            profiles = {int(k): _load_profile(v) for k, v in data.items()}
+            self._profiles = {user_id: profile for user_id, profile in profiles.items() if profile is not None}
+
+    async def start(self) -> None:
+        """Load profiles from the SQLite store; an existing JSON cache seeds an empty table once."""
+        if self._db is None:
+            return
+        rows = await self._db.fetchall(LOAD_PROFILES)
+        if not rows:
+            self._dirty.update(self._profiles)
+            await self.flush()
+            return
+        profiles: Dict[int, User] = {}
+        for row in rows:
+            try:
+                profile = _load_profile(json.loads(row["data"]))
+                if profile is not None:
+                    profiles[int(row["user_id"])] = profile
+            except (json.JSONDecodeError, TypeError, ValueError):
+                continue
+        self._profiles = profiles
+
+    async def close(self) -> None:
+        if self._flush_task is not None:
+            await self._flush_task
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        await self.flush()
+
+    def _save(self, user_id: int) -> None:
+        self._dirty.add(user_id)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            if self._db is None:
+                self._write_json(self._snapshot())
+                self._dirty.clear()
+            return
+        if self._flush_handle is None:
+            self._flush_handle = loop.call_later(self._save_delay, self._start_flush, context=detached_context())
+
+    def _start_flush(self) -> None:
+        self._flush_handle = None
+        self._flush_task = asyncio.create_task(self._background_flush())
 
-    def _save(self) -> None:
+    async def _background_flush(self) -> None:
         try:
-            self._storage_path.write_text(
-                json.dumps(self._profiles, ensure_ascii=False),
-                encoding="utf-8",
-            )
+            await self.flush()
+        except Exception:
+            # تغییرات در _dirty می‌مانند و همین‌جا دوباره زمان‌بندی می‌شوند، حتی اگر تغییر تازه‌ای نرسد
+            logger.exception("ذخیره %d پروفایل در پس‌زمینه با خطا مواجه شد", len(self._dirty))
+            if self._flush_handle is None:
+                loop = asyncio.get_running_loop()
+                self._flush_handle = loop.call_later(max(self._save_delay, FLUSH_RETRY_DELAY), self._start_flush)
+
+    async def flush(self) -> None:
+        """Persist every change made since the last flush; safe to call at any time."""
+        async with self._flush_lock:
+            if not self._dirty:
+                return
+            dirty, self._dirty = self._dirty, set()
+            try:
+                if self._db is None:
+                    await asyncio.to_thread(self._write_json, self._snapshot())
+                else:
+                    await self._write_rows(dirty)
+            except Exception:
+                self._dirty |= dirty
+                raise
+
+    def _snapshot(self) -> Dict[int, dict]:
+        # رکوردهای User مستقیم به JSON تبدیل نمی‌شوند؛ کپی dict پیش از رفتن به thread نوشتن گرفته می‌شود
+        return {user_id: dict(profile) for user_id, profile in self._profiles.items()}
+
+    def _write_json(self, profiles: Dict[int, dict]) -> None:
+        tmp = self._storage_path.with_name(self._storage_path.name + ".tmp")
+        try:
+            tmp.write_text(json.dumps(profiles, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, self._storage_path)
         except OSError:
             pass
 
-    def set_profile(self, user_id: int, profile: dict) -> None:
-        self._profiles[user_id] = profile
-        self._save()
+    async def _write_rows(self, user_ids: Set[int]) -> None:
+        now = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+        upserts: List[tuple] = []
+        deletes: List[tuple] = []
+        for user_id in user_ids:
+            profile = self._profiles.get(user_id)
+            if profile is None:
+                deletes.append((user_id,))
+            else:
+                upserts.append((user_id, json.dumps(dict(profile), ensure_ascii=False), now))
+        if upserts:
+            await self._db.executemany(UPSERT_PROFILE, upserts)
+        if deletes:
+            await self._db.executemany(DELETE_PROFILE, deletes)
+
+    def set_profile(self, user_id: int, profile: User) -> None:
+        self._profiles[user_id] = as_record(User, profile)
+        self._validated_at[user_id] = time.monotonic()
+        self._save(user_id)
 
-    def get_profile(self, user_id: int) -> Optional[dict]:
+    def get_profile(self, user_id: int) -> Optional[User]:
         return self._profiles.get(user_id)
 
-    async def ensure_profile(self, user_id: int, user_service) -> Optional[dict]:
+    async def ensure_profile(self, user_id: int, user_service) -> Optional[User]:
         """
         Validate the cached profile against DB; clears cache if user is missing or inactive.
+        A profile validated within `profile_ttl` seconds is returned without a DB hit.
         """
         cached = self._profiles.get(user_id)
+        if cached is not None and self._is_fresh(user_id):
+            return cached
         db_user = await user_service.get_by_telegram(user_id)
         if not db_user or not db_user.get("active", 1):
             self.clear_profile(user_id)
@@ -50,13 +196,32 @@ class SessionManager:
         if not cached or cached != db_user:
             self.set_profile(user_id, db_user)
             return db_user
+        self._validated_at[user_id] = time.monotonic()
         return cached
 
+    def _is_fresh(self, user_id: int) -> bool:
+        validated_at = self._validated_at.get(user_id)
+        if validated_at is None:
+            return False
+        return time.monotonic() - validated_at < self._profile_ttl
+
+    def invalidate(self, user_id: int) -> None:
+        self._validated_at.pop(user_id, None)
+
+    def invalidate_user(self, db_user_id: int, telegram_id: Optional[int] = None) -> None:
+        """Hook for UserService: forces the next ensure_profile of that user to hit the DB."""
+        if telegram_id is not None:
+            self.invalidate(telegram_id)
+        for cached_id, profile in self._profiles.items():
+            if profile.get("id") == db_user_id:
+                self.invalidate(cached_id)
+
     def clear_profile(self, user_id: int) -> None:
+        self._validated_at.pop(user_id, None)
         updated = self._profiles.pop(user_id, None)
         self._pending_project.pop(user_id, None)
         if updated is not None:
-            self._save()
+            self._save(user_id)
 
     def set_pending_project(self, user_id: int, project_id: int) -> None:
         self._pending_project[user_id] = project_id
@@ -65,15 +230,20 @@ class SessionManager:
         return self._pending_project.pop(user_id, None)
 
     def add_inline_message(self, user_id: int, message_id: int) -> None:
-        self._inline_messages.setdefault(user_id, set()).add(message_id)
+        messages = self._inline_messages.setdefault(user_id, OrderedDict())
+        messages[message_id] = None
+        messages.move_to_end(message_id)
+        while len(messages) > self._inline_message_limit:
+            messages.popitem(last=False)
 
-    def consume_inline_messages(self, user_id: int) -> Set[int]:
-        return self._inline_messages.pop(user_id, set())
+    def consume_inline_messages(self, user_id: int) -> List[int]:
+        """Tracked message ids of the user, oldest first; tracking starts over afterwards."""
+        return list(self._inline_messages.pop(user_id, ()))
 
     def discard_inline_message(self, user_id: int, message_id: int) -> None:
         messages = self._inline_messages.get(user_id)
         if not messages:
             return
-        messages.discard(message_id)
+        messages.pop(message_id, None)
         if not messages:
             self._inline_messages.pop(user_id, None)
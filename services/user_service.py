@@ -1,49 +1,71 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Callable, List, Optional
 
 from core.constants import ROLES
+from db.queries import register
+from db.records import User
+
+GET_BY_PHONE = register("users.get_by_phone", f"SELECT {User.COLUMNS} FROM users WHERE phone = ?", record=User)
+INSERT_USER = register(
+    "users.insert",
+    "INSERT INTO users(phone, name, role, created_at, active) VALUES (?, ?, ?, ?, 1) RETURNING id",
+)
+LIST_USERS = register(
+    "users.list",
+    f"SELECT {User.COLUMNS} FROM users ORDER BY name ASC",
+    expect_index="idx_users_name",
+    record=User,
+)
+GET_BY_NAME = register("users.get_by_name", f"SELECT {User.COLUMNS} FROM users WHERE name = ?", record=User)
+GET_BY_ID = register("users.get_by_id", f"SELECT {User.COLUMNS} FROM users WHERE id = ?", record=User)
+GET_BY_TELEGRAM = register("users.get_by_telegram", f"SELECT {User.COLUMNS} FROM users WHERE telegram_id = ?", record=User)
+UPDATE_TELEGRAM_ID = register("users.update_telegram_id", "UPDATE users SET telegram_id = ? WHERE id = ?")
+SET_ACTIVE = register("users.set_active", "UPDATE users SET active = ? WHERE id = ?")
+
+UserChangeListener = Callable[[int, Optional[int]], None]
 
 
 class UserService:
     def __init__(self, database):
         self._db = database
+        self._listeners: List[UserChangeListener] = []
+
+    def subscribe(self, listener: UserChangeListener) -> None:
+        """Register a callback invoked as listener(user_id, telegram_id) after a user changes."""
+        self._listeners.append(listener)
+
+    def _notify(self, user_id: int, telegram_id: Optional[int] = None) -> None:
+        for listener in self._listeners:
+            listener(user_id, telegram_id)
 
-    async def get_by_phone(self, phone: str) -> Optional[dict]:
-        return await self._db.fetchone("SELECT * FROM users WHERE phone = ?", (phone,))
+    async def get_by_phone(self, phone: str) -> Optional[User]:
+        return await self._db.fetchone(GET_BY_PHONE, (phone,))
 
     async def create_user(self, phone: str, name: str, role: str) -> int:
         if role not in ROLES:
             raise ValueError("نقش انتخاب شده معتبر نیست")
         created_at = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
-        await self._db.execute(
-            "INSERT INTO users(phone, name, role, created_at, active) VALUES (?, ?, ?, ?, 1)",
-            (phone, name, role, created_at),
-        )
-        row = await self._db.fetchone("SELECT id FROM users WHERE phone = ?", (phone,))
-        return row["id"] if row else 0
+        row = await self._db.execute_returning(INSERT_USER, (phone, name, role, created_at))
+        user_id = row["id"] if row else 0
+        self._notify(user_id)
+        return user_id
 
-    async def list_users(self) -> List[dict]:
-        return await self._db.fetchall(
-            "SELECT id, name, phone, role, telegram_id, created_at, active FROM users ORDER BY name ASC"
-        )
+    async def list_users(self) -> List[User]:
+        return await self._db.fetchall(LIST_USERS)
 
-    async def get_by_name(self, name: str) -> Optional[dict]:
-        return await self._db.fetchone("SELECT * FROM users WHERE name = ?", (name,))
+    async def get_by_name(self, name: str) -> Optional[User]:
+        return await self._db.fetchone(GET_BY_NAME, (name,))
 
-    async def get_by_id(self, user_id: int) -> Optional[dict]:
-        return await self._db.fetchone("SELECT * FROM users WHERE id = ?", (user_id,))
+    async def get_by_id(self, user_id: int) -> Optional[User]:
+        return await self._db.fetchone(GET_BY_ID, (user_id,))
 
-    async def get_by_telegram(self, telegram_id: int) -> Optional[dict]:
-        return await self._db.fetchone("SELECT * FROM users WHERE telegram_id = ?", (telegram_id,))
+    async def get_by_telegram(self, telegram_id: int) -> Optional[User]:
+        return await self._db.fetchone(GET_BY_TELEGRAM, (telegram_id,))
 
     async def update_telegram_id(self, user_id: int, telegram_id: int) -> None:
-        await self._db.execute(
-            "UPDATE users SET telegram_id = ? WHERE id = ?",
-            (telegram_id, user_id),
-        )
+        await self._db.execute(UPDATE_TELEGRAM_ID, (telegram_id, user_id))
+        self._notify(user_id, telegram_id)
 
     async def set_active(self, user_id: int, active: bool) -> None:
-        await self._db.execute(
-            "UPDATE users SET active = ? WHERE id = ?",
-            (1 if active else 0, user_id),
-        )
+        await self._db.execute(SET_ACTIVE, (1 if active else 0, user_id))
+        self._notify(user_id)